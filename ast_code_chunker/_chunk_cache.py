@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Persistent chunk and embedding caches for the AST Code Chunker
+
+Stores the chunks produced for a file in a SQLite database keyed by the file's
+path and the SHA-256 of its contents, so re-chunking an unchanged file
+skips parsing entirely. Embeddings are kept in the same database keyed by a
+hash of (model, chunk text), so re-indexing unchanged chunks skips Ollama.
+"""
+
+import os
+import time
+import array
+import pickle
+import sqlite3
+import hashlib
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from ast_chunker import CodeChunk
+
+
+DEFAULT_CACHE_PATH = Path.home() / ".cache" / "ast_code_chunker" / "chunks.db"
+
+
+class ChunkCache:
+    """
+    SQLite-backed cache of chunk lists keyed by (path, content SHA-256).
+    
+    The path is used exactly as given, not normalized: cached chunks carry
+    the ``file_path`` (and IDs derived from it) of the call that produced
+    them, so ``a.py`` and ``/proj/a.py`` must not share entries.
+    
+    The database is opened lazily and uses WAL journaling so concurrent readers
+    (e.g. several CLI invocations) don't block each other.
+    """
+    
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Initialize the chunk cache.
+        
+        Args:
+            db_path: Path to the SQLite database (defaults to ~/.cache/ast_code_chunker/chunks.db)
+        """
+        self.db_path = Path(db_path or os.environ.get('AST_CHUNKER_CACHE', DEFAULT_CACHE_PATH))
+        self._conn: Optional[sqlite3.Connection] = None
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use and make sure the table exists."""
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.db_path))
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS chunks ("
+                "path TEXT, sha TEXT, blob BLOB, PRIMARY KEY (path, sha))"
+            )
+        return self._conn
+    
+    @staticmethod
+    def file_sha(file_path: str) -> str:
+        """SHA-256 hex digest of a file's contents, as used for cache keys."""
+        with open(file_path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    
+    def get(self, file_path: str, sha: str) -> Optional[List[CodeChunk]]:
+        """Return the cached chunks for a file version, or None on a miss."""
+        row = self._connect().execute(
+            "SELECT blob FROM chunks WHERE path = ? AND sha = ?",
+            (file_path, sha)
+        ).fetchone()
+        if row is None:
+            return None
+        # Entries written before chunks were stored as tuples hold dicts
+        return [CodeChunk(*data) if type(data) is tuple else CodeChunk(**data)
+                for data in pickle.loads(row[0])]
+    
+    def put(self, file_path: str, sha: str, chunks: List[CodeChunk]):
+        """Store the chunks for a file version, replacing older versions of the file."""
+        blob = pickle.dumps([chunk.to_tuple() for chunk in chunks], protocol=pickle.HIGHEST_PROTOCOL)
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM chunks WHERE path = ? AND sha != ?", (file_path, sha))
+            conn.execute(
+                "INSERT OR REPLACE INTO chunks (path, sha, blob) VALUES (?, ?, ?)",
+                (file_path, sha, blob)
+            )
+    
+    def chunk_file(self, chunker, file_path: str) -> List[CodeChunk]:
+        """
+        Chunk a file through the cache.
+        
+        Args:
+            chunker: Any chunker with a ``chunk_file(path)`` method
+            file_path: Path to the code file
+        
+        Returns:
+            List of CodeChunk objects, from the cache when the contents are unchanged
+        """
+        sha = self.file_sha(file_path)
+        chunks = self.get(file_path, sha)
+        if chunks is None:
+            chunks = chunker.chunk_file(file_path)
+            self.put(file_path, sha, chunks)
+        return chunks
+
+
+class EmbeddingCache:
+    """
+    SQLite-backed cache of embedding vectors keyed by a hash of (model, text).
+    
+    Vectors are stored as packed float32, which is the precision Weaviate keeps
+    anyway. The least recently used entries are dropped once the cache holds
+    more than ``max_entries`` vectors.
+    """
+    
+    # SQLite's default limit on bound parameters per statement is 999
+    _QUERY_CHUNK = 500
+    
+    def __init__(self, db_path: Optional[str] = None, max_entries: int = 50000):
+        """
+        Initialize the embedding cache.
+        
+        Args:
+            db_path: Path to the SQLite database (defaults to the chunk cache database)
+            max_entries: Number of vectors kept before the least recently used are evicted
+        """
+        self.db_path = Path(db_path or os.environ.get('AST_CHUNKER_CACHE', DEFAULT_CACHE_PATH))
+        self.max_entries = max_entries
+        self._conn: Optional[sqlite3.Connection] = None
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use and make sure the table exists."""
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            # Indexing may look vectors up from the embedding worker threads
+            self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "key TEXT PRIMARY KEY, vector BLOB, used REAL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS embeddings_used ON embeddings (used)")
+        return self._conn
+    
+    @staticmethod
+    def key(model: str, text: str) -> str:
+        """Cache key for the embedding of ``text`` by ``model``."""
+        return hashlib.blake2b(f"{model}\0{text}".encode('utf-8'), digest_size=16).hexdigest()
+    
+    def get_many(self, keys: Iterable[str]) -> Dict[str, List[float]]:
+        """Return the cached vectors among ``keys``, marking them as recently used."""
+        keys = list(dict.fromkeys(keys))
+        conn = self._connect()
+        found = {}
+        for start in range(0, len(keys), self._QUERY_CHUNK):
+            part = keys[start:start + self._QUERY_CHUNK]
+            rows = conn.execute(
+                f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(part))})",
+                part
+            ).fetchall()
+            for key, blob in rows:
+                found[key] = array.array('f', blob).tolist()
+        
+        if found:
+            now = time.time()
+            with conn:
+                conn.executemany("UPDATE embeddings SET used = ? WHERE key = ?",
+                                 [(now, key) for key in found])
+        return found
+    
+    def put_many(self, vectors: Dict[str, List[float]]):
+        """Store vectors by key, then evict the least recently used beyond ``max_entries``."""
+        if not vectors:
+            return
+        now = time.time()
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector, used) VALUES (?, ?, ?)",
+                [(key, array.array('f', vector).tobytes(), now) for key, vector in vectors.items()]
+            )
+            excess = conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0] - self.max_entries
+            if excess > 0:
+                conn.execute(
+                    "DELETE FROM embeddings WHERE key IN "
+                    "(SELECT key FROM embeddings ORDER BY used LIMIT ?)",
+                    (excess,)
+                )
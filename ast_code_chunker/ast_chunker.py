@@ -7,21 +7,237 @@ to create semantically meaningful chunks for code retrieval and understanding.
 """
 
 import ast
+import os
+import sys
 import json
+import mmap
+import copy
 import hashlib
-from typing import List, Dict, Any, Optional, Tuple
-from dataclasses import dataclass, asdict
+import functools
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple, Union
+from dataclasses import dataclass, replace
 from pathlib import Path
-import textwrap
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    # Optional C-level parsers for non-Python languages
+    from tree_sitter_languages import get_parser as _get_tree_sitter_parser
+except ImportError:
+    _get_tree_sitter_parser = None
+
+try:
+    # RE2 matches in linear time, so minified/generated sources can't trigger
+    # catastrophic backtracking in the generic function pattern below
+    import re2 as _regex
+except ImportError:
+    import re as _regex
+
+
+# Chunk types. These stay plain strings because they are persisted and filtered
+# on as text in Weaviate; as shared interned literals they compare by identity
+CHUNK_CLASS = 'class'
+CHUNK_FUNCTION = 'function'
+CHUNK_METHOD = 'method'
+CHUNK_MODULE_DOCSTRING = 'module_docstring'
+CHUNK_IMPORT = 'import'
+CHUNK_GLOBAL = 'global'
+CHUNK_CODE_BLOCK = 'code_block'
+
+CHUNK_TYPES = (
+    CHUNK_CLASS, CHUNK_FUNCTION, CHUNK_METHOD, CHUNK_MODULE_DOCSTRING,
+    CHUNK_IMPORT, CHUNK_GLOBAL, CHUNK_CODE_BLOCK,
+)
+
+
+# Files at least this large are memory-mapped rather than read; below it the
+# mapping setup costs more than the copy it saves
+_MMAP_MIN_SIZE = 4096
+
+
+# Function detection for C-like languages without a dedicated parser
+_FUNC_RE = _regex.compile(
+    r'(?s)((?:public|private|protected|static|async|def|function|func)\s+[\w<>]+\s+\w+\s*\([^)]*\)\s*\{[^}]*\})'
+)
+
+
+def _chunk_id(key: str) -> str:
+    """Derive a stable 12-character chunk ID from a key string."""
+    # IDs only need to be stable and well spread, not cryptographically strong;
+    # a 6-byte BLAKE2b digest is cheaper than MD5 and needs no truncation
+    return hashlib.blake2b(key.encode(), digest_size=6).hexdigest()
+
+
+def _has_docstring(node: ast.AST) -> bool:
+    """Cheap docstring presence check; unlike ast.get_docstring it skips cleandoc."""
+    body = node.body
+    return (
+        bool(body)
+        and isinstance(body[0], ast.Expr)
+        and isinstance(body[0].value, ast.Constant)
+        and isinstance(body[0].value.value, str)
+    )
+
+
+# Line boundaries str.splitlines() recognizes besides '\n'
+_OTHER_LINE_BREAKS = ('\r', '\v', '\f', '\x1c', '\x1d', '\x1e', '\x85', '\u2028', '\u2029')
+
+
+def _copy_chunks(chunks: List['CodeChunk']) -> List['CodeChunk']:
+    """Copy chunks held in a cache, down to their metadata, before handing them out."""
+    return [replace(chunk, metadata=copy.deepcopy(chunk.metadata)) for chunk in chunks]
+
+
+def _line_starts(text: str) -> List[int]:
+    """Offsets at which each line of ``text`` begins."""
+    starts = [0] if text else []
+    last = len(text) - 1
+    
+    if np is not None and text.isascii():
+        # Byte offsets equal str offsets for ASCII, so NumPy can locate every
+        # newline in one vectorized comparison instead of a Python-level loop
+        newlines = np.flatnonzero(np.frombuffer(text.encode('ascii'), dtype=np.uint8) == 10)
+        starts.extend((newlines[newlines < last] + 1).tolist())
+        return starts
+    
+    find = text.find
+    pos = find('\n')
+    while pos != -1 and pos < last:
+        starts.append(pos + 1)
+        pos = find('\n', pos + 1)
+    return starts
+
+
+def _iter_line_blocks(text: str, block_size: int):
+    """
+    Yield ``(start_line, end_line, block)`` for consecutive runs of ``block_size`` lines.
+    
+    Each block is a single slice of ``text`` located via precomputed line
+    offsets, rather than splitting the whole text into lines and re-joining them.
+    Text with other line boundaries (``\\r\\n``, ``\\r``, form feeds, ...) is
+    split with ``splitlines()`` instead, so blocks come out the same either way.
+    """
+    if any(sep in text for sep in _OTHER_LINE_BREAKS):
+        lines = text.splitlines()
+        for i in range(0, len(lines), block_size):
+            yield i + 1, min(i + block_size, len(lines)), '\n'.join(lines[i:i + block_size])
+        return
+    
+    starts = _line_starts(text)
+    num_lines = len(starts)
+    text_end = len(text) - 1 if text.endswith('\n') else len(text)
+    
+    for i in range(0, num_lines, block_size):
+        j = i + block_size
+        end = starts[j] - 1 if j < num_lines else text_end
+        yield i + 1, min(j, num_lines), text[starts[i]:end]
+
+
+def _common_prefix_len(a: bytes, b: bytes) -> int:
+    """Length of the common prefix of two byte strings (binary search over C-level compares)."""
+    lo, hi = 0, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[:mid] == b[:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _common_suffix_len(a: bytes, b: bytes, limit: int) -> int:
+    """Length of the common suffix of two byte strings, capped at ``limit``."""
+    lo, hi = 0, limit
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[len(a) - mid:] == b[len(b) - mid:]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _byte_point(source: bytes, offset: int) -> Tuple[int, int]:
+    """tree-sitter (row, column) point of a byte offset."""
+    row = source.count(b'\n', 0, offset)
+    return row, offset - (source.rfind(b'\n', 0, offset) + 1)
 
-@dataclass
+
+class _Collector(ast.NodeVisitor):
+    """
+    Single-pass visitor that sorts a module's top-level statements by category.
+    
+    Only the module body is descended into: class and function bodies are never
+    visited, so methods and nested functions are excluded without any ancestry
+    checks.
+    """
+    
+    def __init__(self):
+        self.imports: List[ast.AST] = []
+        self.globals: List[ast.AST] = []
+        self.definitions: List[ast.AST] = []  # classes and functions, in source order
+    
+    def visit_Module(self, node: ast.Module):
+        super().generic_visit(node)
+    
+    def generic_visit(self, node: ast.AST):
+        # Statements we don't chunk (and everything below them) are skipped
+        pass
+    
+    def visit_Import(self, node: ast.Import):
+        self.imports.append(node)
+    
+    def visit_ImportFrom(self, node: ast.ImportFrom):
+        self.imports.append(node)
+    
+    def visit_If(self, node: ast.If):
+        # Guarded imports (e.g. `if TYPE_CHECKING:`) are looked for one level down only
+        self._collect_imports(itertools.chain(node.body, node.orelse))
+    
+    def visit_Try(self, node: ast.Try):
+        # Likewise for optional imports wrapped in try/except ImportError
+        self._collect_imports(itertools.chain(
+            node.body,
+            *(handler.body for handler in node.handlers),
+            node.orelse,
+            node.finalbody,
+        ))
+    
+    def _collect_imports(self, statements):
+        for stmt in statements:
+            if isinstance(stmt, (ast.Import, ast.ImportFrom)):
+                self.imports.append(stmt)
+    
+    def visit_ClassDef(self, node: ast.ClassDef):
+        self.definitions.append(node)
+    
+    def visit_FunctionDef(self, node: ast.FunctionDef):
+        self.definitions.append(node)
+    
+    def visit_Assign(self, node: ast.Assign):
+        self.globals.append(node)
+    
+    def visit_AnnAssign(self, node: ast.AnnAssign):
+        self.globals.append(node)
+
+
+@dataclass(slots=True)
 class CodeChunk:
     """Represents a semantic code chunk extracted from source code."""
     
     id: str
     content: str
-    chunk_type: str  # 'class', 'function', 'method', 'module_docstring', 'import', 'global'
+    chunk_type: str  # one of CHUNK_TYPES
     metadata: Dict[str, Any]
     start_line: int
     end_line: int
@@ -29,13 +245,67 @@ class CodeChunk:
     language: str = 'python'
     parent_context: Optional[str] = None
     
+    @property
+    def content_preview(self) -> str:
+        """First 300 characters of the content, with "..." if it was cut."""
+        if len(self.content) > 300:
+            return self.content[:300] + "..."
+        return self.content
+    
+    @property
+    def content_oneline(self) -> str:
+        """First 150 characters of the content on a single line, with "..." if it was cut."""
+        oneline = self.content[:150].replace('\n', ' ')
+        if len(self.content) > 150:
+            oneline += "..."
+        return oneline
+    
     def to_dict(self) -> Dict[str, Any]:
-        """Convert chunk to dictionary for storage."""
-        return asdict(self)
+        """
+        Convert chunk to dictionary for storage.
+        
+        Built directly rather than via ``dataclasses.asdict``, which deep-copies
+        every field; ``metadata`` is shared with the chunk, not copied.
+        """
+        return {
+            'id': self.id,
+            'content': self.content,
+            'chunk_type': self.chunk_type,
+            'metadata': self.metadata,
+            'start_line': self.start_line,
+            'end_line': self.end_line,
+            'file_path': self.file_path,
+            'language': self.language,
+            'parent_context': self.parent_context,
+        }
+    
+    def to_tuple(self) -> Tuple:
+        """
+        Field values in declaration order, so ``CodeChunk(*chunk.to_tuple())``
+        rebuilds the chunk. A compact record form for bulk storage.
+        """
+        return (self.id, self.content, self.chunk_type, self.metadata, self.start_line,
+                self.end_line, self.file_path, self.language, self.parent_context)
     
     def to_json(self) -> str:
         """Convert chunk to JSON string."""
+        if orjson is not None:
+            return self.to_json_bytes().decode('utf-8')
         return json.dumps(self.to_dict(), indent=2)
+    
+    def to_json_bytes(self) -> bytes:
+        """Convert chunk to UTF-8 encoded JSON, skipping the str round-trip when orjson is available."""
+        if orjson is not None:
+            return orjson.dumps(self.to_dict(), option=orjson.OPT_INDENT_2)
+        return json.dumps(self.to_dict(), indent=2).encode('utf-8')
+
+
+def chunks_to_json_bytes(chunks: List[CodeChunk]) -> bytes:
+    """Serialize a list of chunks as an indented UTF-8 JSON array (via orjson when available)."""
+    chunks_data = [chunk.to_dict() for chunk in chunks]
+    if orjson is not None:
+        return orjson.dumps(chunks_data, option=orjson.OPT_INDENT_2)
+    return json.dumps(chunks_data, indent=2).encode('utf-8')
 
 
 class ASTCodeChunker:
@@ -50,21 +320,43 @@ class ASTCodeChunker:
     - Global variables and constants
     """
     
-    def __init__(self, max_chunk_size: int = 1500, include_context: bool = True):
+    # Number of recently chunked files whose results chunk_file keeps in memory
+    FILE_CACHE_SIZE = 256
+    
+    def __init__(self, max_chunk_size: int = 1500, include_context: bool = True,
+                 use_cache: bool = True):
         """
         Initialize the AST Code Chunker.
         
         Args:
             max_chunk_size: Maximum size of a chunk in characters
             include_context: Whether to include parent context in chunks
+            use_cache: Whether chunk_file reuses results for files whose content hasn't changed
         """
         self.max_chunk_size = max_chunk_size
         self.include_context = include_context
+        self.use_cache = use_cache
+        self._source_lines: List[str] = []
+        # file path -> ((mtime_ns, size), content digest, chunks), least
+        # recently used first
+        self._cache: Dict[str, Tuple[Tuple[int, int], str, List[CodeChunk]]] = {}
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        # Worker processes (see chunk_files) get a chunker without per-file state
+        state = self.__dict__.copy()
+        state['_source_lines'] = []
+        state['_cache'] = {}
+        return state
         
     def chunk_file(self, file_path: str) -> List[CodeChunk]:
         """
         Chunk a Python file into semantic units.
         
+        Results for the last ``FILE_CACHE_SIZE`` paths are cached: an unchanged
+        mtime and size skip reading the file entirely, and an unchanged content
+        hash skips re-parsing it. Callers get copies of the cached chunks, so
+        modifying them doesn't affect later results.
+        
         Args:
             file_path: Path to the Python file
             
@@ -75,17 +367,71 @@ class ASTCodeChunker:
         if not path.exists():
             raise FileNotFoundError(f"File not found: {file_path}")
         
-        with open(file_path, 'r', encoding='utf-8') as f:
-            source_code = f.read()
+        stat = path.stat()
+        file_key = (stat.st_mtime_ns, stat.st_size)
+        cached = self._cache.get(file_path) if self.use_cache else None
+        if cached is not None and cached[0] == file_key:
+            self._cache[file_path] = self._cache.pop(file_path)
+            return _copy_chunks(cached[2])
+        
+        # Read raw bytes and let ast.parse decode them in the C tokenizer. Larger
+        # files are memory-mapped instead, so the content hash is computed over
+        # the page cache and an unchanged file is never copied into memory
+        with open(file_path, 'rb') as f:
+            if self.use_cache and stat.st_size >= _MMAP_MIN_SIZE:
+                source = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                source = f.read()
         
-        return self.chunk_code(source_code, file_path)
+        if not self.use_cache:
+            return self.chunk_code(source, file_path)
+        
+        try:
+            digest = hashlib.blake2b(source, digest_size=16).hexdigest()
+            if cached is not None and cached[1] == digest:
+                chunks = cached[2]
+            else:
+                chunks = self.chunk_code(bytes(source), file_path)
+        finally:
+            if isinstance(source, mmap.mmap):
+                source.close()
+        
+        # Bounded so a shared chunker indexing a large tree doesn't hold every file's chunks
+        self._cache.pop(file_path, None)
+        if len(self._cache) >= self.FILE_CACHE_SIZE:
+            del self._cache[next(iter(self._cache))]
+        self._cache[file_path] = (file_key, digest, chunks)
+        return _copy_chunks(chunks)
     
-    def chunk_code(self, source_code: str, file_path: str = "unknown") -> List[CodeChunk]:
+    def chunk_files(self, file_paths: List[str], max_workers: Optional[int] = None) -> List[CodeChunk]:
+        """
+        Chunk many Python files in parallel worker processes.
+        
+        Files are independent, so each one is parsed in its own process and the
+        per-file results are concatenated in input order.
+        
+        Args:
+            file_paths: Paths to the Python files
+            max_workers: Number of worker processes (defaults to the CPU count)
+            
+        Returns:
+            List of CodeChunk objects from all files
+        """
+        file_paths = list(file_paths)
+        if len(file_paths) <= 1:
+            # Not worth paying process start-up for a single file
+            return [chunk for path in file_paths for chunk in self.chunk_file(path)]
+        
+        with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+            results = executor.map(self.chunk_file, file_paths, chunksize=16)
+            return list(itertools.chain.from_iterable(results))
+    
+    def chunk_code(self, source_code: Union[str, bytes], file_path: str = "unknown") -> List[CodeChunk]:
         """
         Chunk Python source code into semantic units.
         
         Args:
-            source_code: Python source code as string
+            source_code: Python source code as string or UTF-8 encoded bytes
             file_path: Path to the source file (for metadata)
             
         Returns:
@@ -93,18 +439,30 @@ class ASTCodeChunker:
         """
         chunks = []
         
+        # Decoded text is still needed for slicing node source out of the file
+        if isinstance(source_code, bytes):
+            source_text = source_code.decode('utf-8')
+        else:
+            source_text = source_code
+        
         try:
             tree = ast.parse(source_code)
         except SyntaxError as e:
             # If parsing fails, fall back to line-based chunking
-            return self._fallback_chunk(source_code, file_path)
+            return self._fallback_chunk(source_text, file_path)
+        
+        # Split once; every node extraction slices this list
+        self._source_lines = source_text.splitlines()
+        
+        collector = _Collector()
+        collector.visit(tree)
         
         # Extract module docstring if present
         module_docstring = ast.get_docstring(tree)
         if module_docstring:
             chunks.append(self._create_chunk(
                 content=f'"""Module Documentation"""\n{module_docstring}',
-                chunk_type="module_docstring",
+                chunk_type=CHUNK_MODULE_DOCSTRING,
                 start_line=1,
                 end_line=self._count_lines(module_docstring) + 2,
                 file_path=file_path,
@@ -112,127 +470,119 @@ class ASTCodeChunker:
             ))
         
         # Extract imports
-        imports = self._extract_imports(tree, source_code)
+        imports = self._extract_imports(collector.imports, file_path)
         if imports:
             chunks.extend(imports)
         
         # Extract global variables and constants
-        globals_chunk = self._extract_globals(tree, source_code)
+        globals_chunk = self._extract_globals(collector.globals, file_path)
         if globals_chunk:
             chunks.append(globals_chunk)
         
         # Extract classes and functions
-        for node in ast.walk(tree):
+        for node in collector.definitions:
             if isinstance(node, ast.ClassDef):
-                class_chunks = self._extract_class(node, source_code, file_path)
+                class_chunks = self._extract_class(node, file_path)
                 chunks.extend(class_chunks)
-            elif isinstance(node, ast.FunctionDef) and not self._is_nested_function(tree, node):
-                func_chunk = self._extract_function(node, source_code, file_path)
+            else:
+                func_chunk = self._extract_function(node, file_path)
                 if func_chunk:
                     chunks.append(func_chunk)
         
         return chunks
     
-    def _extract_class(self, node: ast.ClassDef, source: str, file_path: str) -> List[CodeChunk]:
+    def _extract_class(self, node: ast.ClassDef, file_path: str) -> List[CodeChunk]:
         """Extract a class and its methods as separate chunks."""
         chunks = []
-        class_name = node.name
+        # Interned so every method chunk's parent_context shares one string
+        class_name = sys.intern(node.name)
         
         # Extract class docstring and signature
         class_docstring = ast.get_docstring(node)
-        class_header = self._get_node_source(node, source, include_body=False)
+        class_header = self._get_node_source(node, include_body=False)
+        
+        # Methods are gathered once and reused for the overview, metadata and
+        # per-method chunks (`type(...) is` skips isinstance's MRO check)
+        methods = [item for item in node.body if type(item) is ast.FunctionDef]
         
-        # Create class overview chunk
-        class_overview = class_header
+        # Create class overview chunk from parts joined once at the end
+        overview_parts = [class_header]
         if class_docstring:
-            class_overview += f'\n    """{class_docstring}"""'
+            overview_parts.append(f'    """{class_docstring}"""')
         
         # Add method signatures to overview
-        method_signatures = []
-        for item in node.body:
-            if isinstance(item, ast.FunctionDef):
-                sig = self._get_function_signature(item)
-                method_signatures.append(f"    {sig}")
+        if methods:
+            overview_parts.append("\n    # Methods:")
+            overview_parts.extend(f"    {self._get_function_signature(item)}" for item in methods)
         
-        if method_signatures:
-            class_overview += "\n\n    # Methods:\n" + "\n".join(method_signatures)
+        class_overview = "\n".join(overview_parts)
         
         chunks.append(self._create_chunk(
             content=class_overview,
-            chunk_type="class",
+            chunk_type=CHUNK_CLASS,
             start_line=node.lineno,
             end_line=node.end_lineno or node.lineno,
             file_path=file_path,
             metadata={
                 "class_name": class_name,
                 "has_docstring": bool(class_docstring),
-                "num_methods": len([n for n in node.body if isinstance(n, ast.FunctionDef)])
+                "num_methods": len(methods)
             }
         ))
         
+        # Add class context if enabled; the prefix is the same for every method
+        context_prefix = f"# In class: {class_name}\n" if self.include_context else ""
+        
         # Extract methods as separate chunks
-        for item in node.body:
-            if isinstance(item, ast.FunctionDef):
-                method_source = self._get_node_source(item, source)
-                if method_source:
-                    # Add class context if enabled
-                    if self.include_context:
-                        method_content = f"# In class: {class_name}\n{method_source}"
-                    else:
-                        method_content = method_source
-                    
-                    chunks.append(self._create_chunk(
-                        content=method_content,
-                        chunk_type="method",
-                        start_line=item.lineno,
-                        end_line=item.end_lineno or item.lineno,
-                        file_path=file_path,
-                        parent_context=class_name,
-                        metadata={
-                            "class_name": class_name,
-                            "method_name": item.name,
-                            "is_private": item.name.startswith('_'),
-                            "is_dunder": item.name.startswith('__') and item.name.endswith('__'),
-                            "has_docstring": bool(ast.get_docstring(item))
-                        }
-                    ))
+        for item in methods:
+            method_source = self._get_node_source(item)
+            if method_source:
+                method_content = context_prefix + method_source if context_prefix else method_source
+                
+                chunks.append(self._create_chunk(
+                    content=method_content,
+                    chunk_type=CHUNK_METHOD,
+                    start_line=item.lineno,
+                    end_line=item.end_lineno or item.lineno,
+                    file_path=file_path,
+                    parent_context=class_name,
+                    metadata={
+                        "class_name": class_name,
+                        "method_name": item.name,
+                        "is_private": item.name.startswith('_'),
+                        "is_dunder": item.name.startswith('__') and item.name.endswith('__'),
+                        "has_docstring": _has_docstring(item)
+                    }
+                ))
         
         return chunks
     
-    def _extract_function(self, node: ast.FunctionDef, source: str, file_path: str) -> Optional[CodeChunk]:
+    def _extract_function(self, node: ast.FunctionDef, file_path: str) -> Optional[CodeChunk]:
         """Extract a standalone function as a chunk."""
-        func_source = self._get_node_source(node, source)
+        func_source = self._get_node_source(node)
         if not func_source:
             return None
         
         return self._create_chunk(
             content=func_source,
-            chunk_type="function",
+            chunk_type=CHUNK_FUNCTION,
             start_line=node.lineno,
             end_line=node.end_lineno or node.lineno,
             file_path=file_path,
             metadata={
                 "function_name": node.name,
                 "is_private": node.name.startswith('_'),
-                "has_docstring": bool(ast.get_docstring(node)),
+                "has_docstring": _has_docstring(node),
                 "num_args": len(node.args.args)
             }
         )
     
-    def _extract_imports(self, tree: ast.Module, source: str) -> List[CodeChunk]:
+    def _extract_imports(self, import_nodes: List[ast.AST], file_path: str) -> List[CodeChunk]:
         """Extract import statements as a single chunk."""
-        import_lines = []
-        import_nodes = []
-        
-        for node in ast.walk(tree):
-            if isinstance(node, (ast.Import, ast.ImportFrom)):
-                import_nodes.append(node)
-        
         if not import_nodes:
             return []
         
-        # Sort by line number
-        import_nodes.sort(key=lambda x: x.lineno)
+        # import_nodes arrive in source order from _Collector, so no sort is needed
         
         # Group consecutive imports
         import_groups = []
@@ -262,48 +612,49 @@ class ASTCodeChunker:
             if lines:
                 chunks.append(self._create_chunk(
                     content="\n".join(lines),
-                    chunk_type="import",
+                    chunk_type=CHUNK_IMPORT,
                     start_line=group[0].lineno,
                     end_line=group[-1].lineno,
-                    file_path=source,
+                    file_path=file_path,
                     metadata={"num_imports": len(lines)}
                 ))
         
         return chunks
     
-    def _extract_globals(self, tree: ast.Module, source: str) -> Optional[CodeChunk]:
+    def _extract_globals(self, assign_nodes: List[ast.AST], file_path: str) -> Optional[CodeChunk]:
         """Extract global variables and constants."""
-        global_statements = []
+        global_nodes = []
         
-        for node in tree.body:
+        for node in assign_nodes:
             if isinstance(node, ast.Assign):
                 # Check if it's a module-level assignment
-                for target in node.targets:
-                    if isinstance(target, ast.Name):
-                        line = self._get_node_source(node, source)
-                        if line:
-                            global_statements.append(line)
+                if any(isinstance(target, ast.Name) for target in node.targets):
+                    global_nodes.append(node)
             elif isinstance(node, ast.AnnAssign) and isinstance(node.target, ast.Name):
-                line = self._get_node_source(node, source)
-                if line:
-                    global_statements.append(line)
+                global_nodes.append(node)
         
-        if not global_statements:
+        if not global_nodes:
             return None
         
+        # Module-level statements are unindented, so their lines can be taken verbatim
+        lines = self._source_lines
+        content = "\n".join(
+            line for node in global_nodes for line in lines[node.lineno - 1:node.end_lineno]
+        )
+        
         return self._create_chunk(
-            content="\n".join(global_statements),
-            chunk_type="global",
+            content=content,
+            chunk_type=CHUNK_GLOBAL,
             start_line=1,
-            end_line=len(source.splitlines()),
-            file_path=source,
-            metadata={"num_globals": len(global_statements)}
+            end_line=max(node.end_lineno for node in global_nodes),
+            file_path=file_path,
+            metadata={"num_globals": len(global_nodes)}
         )
     
-    def _get_node_source(self, node: ast.AST, source: str, include_body: bool = True) -> Optional[str]:
-        """Get the source code for an AST node."""
+    def _get_node_source(self, node: ast.AST, include_body: bool = True) -> Optional[str]:
+        """Get the source code for an AST node from the current file's lines."""
         try:
-            lines = source.splitlines()
+            lines = self._source_lines
             if hasattr(node, 'lineno') and hasattr(node, 'end_lineno'):
                 start = node.lineno - 1
                 end = node.end_lineno
@@ -316,9 +667,18 @@ class ASTCodeChunker:
                             break
                 
                 node_lines = lines[start:end]
-                # Remove common indentation
                 if node_lines:
-                    return textwrap.dedent("\n".join(node_lines))
+                    # Strip the node's own indentation; col_offset already tells us its width
+                    indent = node.col_offset
+                    dedented = []
+                    for line in node_lines:
+                        if line.isspace():
+                            dedented.append("")
+                        elif line[:indent].isspace():
+                            dedented.append(line[indent:])
+                        else:
+                            dedented.append(line)
+                    return "\n".join(dedented)
             return None
         except Exception:
             return None
@@ -347,20 +707,12 @@ class ASTCodeChunker:
             return f"from {module} import {', '.join(names)}"
         return None
     
-    def _is_nested_function(self, tree: ast.Module, func_node: ast.FunctionDef) -> bool:
-        """Check if a function is nested inside a class or another function."""
-        for node in ast.walk(tree):
-            if isinstance(node, (ast.ClassDef, ast.FunctionDef)) and node != func_node:
-                if any(child == func_node for child in ast.walk(node)):
-                    return True
-        return False
-    
     def _create_chunk(self, content: str, chunk_type: str, start_line: int, 
                      end_line: int, file_path: str, parent_context: Optional[str] = None,
                      metadata: Optional[Dict[str, Any]] = None) -> CodeChunk:
         """Create a CodeChunk object with a unique ID."""
         # Generate unique ID based on content
-        chunk_id = hashlib.md5(f"{file_path}:{start_line}:{content[:100]}".encode()).hexdigest()[:12]
+        chunk_id = _chunk_id(f"{file_path}:{start_line}:{content[:100]}")
         
         return CodeChunk(
             id=chunk_id,
@@ -376,18 +728,14 @@ class ASTCodeChunker:
     def _fallback_chunk(self, source: str, file_path: str) -> List[CodeChunk]:
         """Fallback to simple line-based chunking if AST parsing fails."""
         chunks = []
-        lines = source.splitlines()
         chunk_size = 50  # Lines per chunk
         
-        for i in range(0, len(lines), chunk_size):
-            chunk_lines = lines[i:i + chunk_size]
-            chunk_content = "\n".join(chunk_lines)
-            
+        for start_line, end_line, chunk_content in _iter_line_blocks(source, chunk_size):
             chunks.append(self._create_chunk(
                 content=chunk_content,
-                chunk_type="code_block",
-                start_line=i + 1,
-                end_line=min(i + chunk_size, len(lines)),
+                chunk_type=CHUNK_CODE_BLOCK,
+                start_line=start_line,
+                end_line=end_line,
                 file_path=file_path,
                 metadata={"fallback": True}
             ))
@@ -399,14 +747,82 @@ class ASTCodeChunker:
         return len(text.splitlines())
 
 
+@functools.lru_cache(maxsize=4)
+def get_chunker(include_context: bool = True, use_cache: bool = True) -> ASTCodeChunker:
+    """
+    Return a shared ASTCodeChunker for the given settings.
+    
+    Reusing one chunker keeps its content-hash cache warm across calls
+    instead of starting from scratch for every file.
+    
+    Args:
+        include_context: Whether to include parent context in chunks
+        use_cache: Whether the chunker keeps its in-memory file cache; callers
+            that go through the on-disk ChunkCache turn it off
+        
+    Returns:
+        ASTCodeChunker instance shared by all callers with the same settings
+    """
+    return ASTCodeChunker(include_context=include_context, use_cache=use_cache)
+
+
 class MultiLanguageASTChunker:
     """
     Multi-language AST chunker that supports various programming languages.
-    Uses python-language-server components for broader language support.
+    Uses python-language-server components for broader language support, and
+    tree-sitter grammars (when tree_sitter_languages is installed) for others.
     """
     
-    def __init__(self):
-        self.python_chunker = ASTCodeChunker()
+    # File extension -> tree-sitter grammar name
+    TREE_SITTER_LANGUAGES = {
+        'js': 'javascript',
+        'jsx': 'javascript',
+        'ts': 'typescript',
+        'tsx': 'tsx',
+        'java': 'java',
+        'go': 'go',
+        'rs': 'rust',
+        'c': 'c',
+        'h': 'c',
+        'cpp': 'cpp',
+        'cc': 'cpp',
+        'hpp': 'cpp',
+        'rb': 'ruby',
+    }
+    
+    # tree-sitter node type -> chunk type
+    TREE_SITTER_NODE_TYPES = {
+        'function_definition': CHUNK_FUNCTION,
+        'function_declaration': CHUNK_FUNCTION,
+        'function_item': CHUNK_FUNCTION,
+        'generator_function_declaration': CHUNK_FUNCTION,
+        'method': CHUNK_METHOD,
+        'method_definition': CHUNK_METHOD,
+        'method_declaration': CHUNK_METHOD,
+        'constructor_declaration': CHUNK_METHOD,
+        'class': CHUNK_CLASS,
+        'class_declaration': CHUNK_CLASS,
+        'class_specifier': CHUNK_CLASS,
+        'interface_declaration': CHUNK_CLASS,
+        'impl_item': CHUNK_CLASS,
+    }
+    
+    # Number of recently parsed files whose trees are kept for incremental reparsing
+    TREE_SITTER_TREE_CACHE_SIZE = 64
+    
+    # Parsers are shared by all instances so each grammar is loaded only once
+    _tree_sitter_parsers: Dict[str, Any] = {}
+    
+    def __init__(self, use_cache: bool = True):
+        """
+        Initialize the multi-language chunker.
+        
+        Args:
+            use_cache: Whether the Python chunker keeps its in-memory file cache
+        """
+        # Last (source, tree) parsed per tree-sitter file, for incremental reparsing
+        self._tree_sitter_trees: Dict[str, Tuple[bytes, Any]] = {}
+        self.python_chunker = get_chunker(use_cache=use_cache)
         self.language_parsers = {
             'python': self.python_chunker,
             'py': self.python_chunker,
@@ -427,30 +843,135 @@ class MultiLanguageASTChunker:
         
         if extension in self.language_parsers:
             return self.language_parsers[extension].chunk_file(file_path)
+        
+        parser = self._get_tree_sitter_parser(extension)
+        if parser is not None:
+            chunks = self._tree_sitter_chunk(file_path, parser, extension)
+            if chunks:
+                return chunks
+        
+        # Fallback to text-based chunking for unsupported languages
+        return self._generic_chunk(file_path)
+    
+    @classmethod
+    def _get_tree_sitter_parser(cls, extension: str):
+        """Return a cached tree-sitter parser for an extension, or None if unavailable."""
+        language = cls.TREE_SITTER_LANGUAGES.get(extension)
+        if language is None or _get_tree_sitter_parser is None:
+            return None
+        
+        parser = cls._tree_sitter_parsers.get(language)
+        if parser is None:
+            try:
+                parser = _get_tree_sitter_parser(language)
+            except Exception:
+                return None
+            cls._tree_sitter_parsers[language] = parser
+        return parser
+    
+    def _tree_sitter_chunk(self, file_path: str, parser, extension: str) -> List[CodeChunk]:
+        """Extract classes, methods and functions from a tree-sitter syntax tree."""
+        with open(file_path, 'rb') as f:
+            source = f.read()
+        
+        tree = self._parse_incremental(file_path, parser, source)
+        language = self.TREE_SITTER_LANGUAGES[extension]
+        chunks = []
+        
+        # Explicit stack of (node, enclosing class name); children are pushed in
+        # reverse so chunks come out in source order
+        stack = [(tree.root_node, None)]
+        while stack:
+            node, class_name = stack.pop()
+            # Anonymous nodes are keyword tokens (e.g. the `class` keyword itself)
+            chunk_type = self.TREE_SITTER_NODE_TYPES.get(node.type) if node.is_named else None
+            
+            if chunk_type is None:
+                stack.extend((child, class_name) for child in reversed(node.children))
+                continue
+            
+            # Rust impl blocks name their type rather than themselves
+            name_node = node.child_by_field_name('name') or node.child_by_field_name('type')
+            name = name_node.text.decode('utf-8', errors='replace') if name_node else None
+            
+            if chunk_type == CHUNK_FUNCTION and class_name:
+                chunk_type = CHUNK_METHOD
+            
+            content = source[node.start_byte:node.end_byte].decode('utf-8', errors='replace')
+            start_line = node.start_point[0] + 1
+            
+            chunks.append(CodeChunk(
+                id=_chunk_id(f"{file_path}:{start_line}:{content[:100]}"),
+                content=content,
+                chunk_type=chunk_type,
+                metadata={"language": extension, "name": name},
+                start_line=start_line,
+                end_line=node.end_point[0] + 1,
+                file_path=file_path,
+                language=language,
+                parent_context=class_name if chunk_type == CHUNK_METHOD else None
+            ))
+            
+            # Only class bodies are descended into, to pick up their methods
+            if chunk_type == CHUNK_CLASS:
+                stack.extend((child, name) for child in reversed(node.children))
+        
+        return chunks
+    
+    def _parse_incremental(self, file_path: str, parser, source: bytes):
+        """
+        Parse a file with tree-sitter, reusing the previous tree of the same path.
+        
+        The changed region is found by trimming the common prefix and suffix of
+        the old and new contents and applied to the old tree as a single edit,
+        so tree-sitter only re-parses the subtrees that overlap it.
+        """
+        previous = self._tree_sitter_trees.get(file_path)
+        if previous is None:
+            tree = parser.parse(source)
         else:
-            # Fallback to text-based chunking for unsupported languages
-            return self._generic_chunk(file_path)
+            old_source, old_tree = previous
+            if old_source == source:
+                return old_tree
+            
+            start = _common_prefix_len(old_source, source)
+            suffix = _common_suffix_len(old_source, source, min(len(old_source), len(source)) - start)
+            old_end = len(old_source) - suffix
+            new_end = len(source) - suffix
+            
+            old_tree.edit(
+                start_byte=start,
+                old_end_byte=old_end,
+                new_end_byte=new_end,
+                start_point=_byte_point(source, start),
+                old_end_point=_byte_point(old_source, old_end),
+                new_end_point=_byte_point(source, new_end),
+            )
+            tree = parser.parse(source, old_tree)
+        
+        # Bounded so indexing a large repository doesn't keep every tree alive
+        self._tree_sitter_trees.pop(file_path, None)
+        if len(self._tree_sitter_trees) >= self.TREE_SITTER_TREE_CACHE_SIZE:
+            del self._tree_sitter_trees[next(iter(self._tree_sitter_trees))]
+        self._tree_sitter_trees[file_path] = (source, tree)
+        return tree
     
     def _generic_chunk(self, file_path: str) -> List[CodeChunk]:
         """Generic chunking for unsupported languages."""
         with open(file_path, 'r', encoding='utf-8') as f:
             content = f.read()
         
-        # Simple function/class detection using regex
-        import re
-        
         chunks = []
         
         # Try to detect functions (works for many C-like languages)
-        func_pattern = r'((?:public|private|protected|static|async|def|function|func)\s+[\w<>]+\s+\w+\s*\([^)]*\)\s*{[^}]*})'
-        functions = re.findall(func_pattern, content, re.DOTALL)
+        functions = _FUNC_RE.findall(content)
         
         for i, func in enumerate(functions):
-            chunk_id = hashlib.md5(f"{file_path}:func_{i}".encode()).hexdigest()[:12]
+            chunk_id = _chunk_id(f"{file_path}:func_{i}")
             chunks.append(CodeChunk(
                 id=chunk_id,
                 content=func,
-                chunk_type="function",
+                chunk_type=CHUNK_FUNCTION,
                 metadata={"language": Path(file_path).suffix.lstrip('.')},
                 start_line=0,
                 end_line=0,
@@ -459,21 +980,18 @@ class MultiLanguageASTChunker:
         
         # If no functions found, do line-based chunking
         if not chunks:
-            lines = content.splitlines()
             chunk_size = 50
             
-            for i in range(0, len(lines), chunk_size):
-                chunk_lines = lines[i:i + chunk_size]
-                chunk_content = "\n".join(chunk_lines)
-                chunk_id = hashlib.md5(f"{file_path}:lines_{i}".encode()).hexdigest()[:12]
+            for start_line, end_line, chunk_content in _iter_line_blocks(content, chunk_size):
+                chunk_id = _chunk_id(f"{file_path}:lines_{start_line - 1}")
                 
                 chunks.append(CodeChunk(
                     id=chunk_id,
                     content=chunk_content,
-                    chunk_type="code_block",
+                    chunk_type=CHUNK_CODE_BLOCK,
                     metadata={"language": Path(file_path).suffix.lstrip('.')},
-                    start_line=i + 1,
-                    end_line=min(i + chunk_size, len(lines)),
+                    start_line=start_line,
+                    end_line=end_line,
                     file_path=file_path
                 ))
         
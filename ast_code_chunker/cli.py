@@ -9,20 +9,24 @@ semantic code search using AST-based chunking.
 import os
 import sys
 import time
+import functools
 import click
-import json
 from pathlib import Path
-from rich.console import Console
-from rich.table import Table
-from rich.syntax import Syntax
-from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn
 
-from verba_integration import VerbaCodeRAG
-from ast_chunker import ASTCodeChunker
+# rich, requests, weaviate, ollama and the chunker are imported inside the
+# commands that use them, so `--help` and shell completion start quickly
 
 
-console = Console()
+console = None
+
+
+def _console():
+    """Return the shared rich Console, importing rich on first use."""
+    global console
+    if console is None:
+        from rich.console import Console
+        console = Console()
+    return console
 
 
 @click.group()
@@ -38,8 +42,29 @@ console = Console()
 @click.option('--collection-name',
               default=lambda: os.environ.get('WEAVIATE_COLLECTION', 'CodeChunks'),
               help='Weaviate collection name')
+@click.option('--batch-size',
+              default=lambda: int(os.environ.get('OLLAMA_EMBED_BATCH_SIZE', 32)),
+              type=int,
+              help='Texts per Ollama embedding request (32 suits CPU, 128 GPU)')
+@click.option('--embed-concurrency',
+              default=lambda: int(os.environ.get('OLLAMA_EMBED_CONCURRENCY', 4)),
+              type=int,
+              help='Ollama embedding requests kept in flight at once')
+@click.option('--pq-segments',
+              default=lambda: int(os.environ.get('WEAVIATE_PQ_SEGMENTS', 0)),
+              type=int,
+              help='Product-quantization segments for a new collection (0 disables)')
+@click.option('--grpc-port',
+              default=lambda: int(os.environ.get('WEAVIATE_GRPC_PORT', 0)),
+              type=int,
+              help='Weaviate gRPC port for inserts and searches (needs weaviate-client v4; 0 uses REST)')
+@click.option('--min-chunk-chars',
+              default=lambda: int(os.environ.get('MIN_CHUNK_CHARS', 20)),
+              type=int,
+              help='Skip chunks shorter than this many characters when indexing (0 keeps all)')
 @click.pass_context
-def cli(ctx, weaviate_url, ollama_url, embedding_model, collection_name):
+def cli(ctx, weaviate_url, ollama_url, embedding_model, collection_name, batch_size, embed_concurrency,
+        pq_segments, grpc_port, min_chunk_chars):
     """AST-based Code RAG System - Intelligent code chunking and retrieval"""
     ctx.ensure_object(dict)
     
@@ -48,40 +73,106 @@ def cli(ctx, weaviate_url, ollama_url, embedding_model, collection_name):
         'weaviate_url': weaviate_url,
         'ollama_url': ollama_url,
         'embedding_model': embedding_model,
-        'collection_name': collection_name
+        'collection_name': collection_name,
+        'embed_batch_size': batch_size,
+        'embed_concurrency': embed_concurrency,
+        'pq_segments': pq_segments,
+        'grpc_port': grpc_port,
+        'min_chunk_chars': min_chunk_chars
     }
     
     # Initialize RAG lazily
     ctx.obj['rag'] = None
 
+def _progress(*columns, transient: bool = True):
+    """
+    Spinner-and-description progress display, plus any extra columns.
+    
+    Disabled when the console isn't a terminal, so piped output and CI logs
+    don't fill up with redraw frames.
+    """
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+    console = _console()
+    return Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        *columns,
+        console=console,
+        disable=not console.is_terminal,
+        transient=transient
+    )
+
+
+_formatter = None
+
+
+@functools.lru_cache(maxsize=32)
+def _lexer(language: str):
+    """Pygments lexer for a language name, falling back to plain text."""
+    from pygments.lexers import get_lexer_by_name
+    from pygments.util import ClassNotFound
+    try:
+        return get_lexer_by_name(language)
+    except ClassNotFound:
+        return get_lexer_by_name('text')
+
+
+def _highlight(code: str, language: str):
+    """
+    Syntax-highlight code straight to ANSI with Pygments and wrap it as rich Text.
+    
+    Cheaper than rich.syntax.Syntax, which re-tokenizes Pygments output into
+    its own segment tree for every result.
+    """
+    global _formatter
+    from pygments import highlight
+    from rich.text import Text
+    if _formatter is None:
+        from pygments.formatters import Terminal256Formatter
+        _formatter = Terminal256Formatter(style='monokai')
+    
+    # Line numbers are added here: the formatter's own linenos option keeps
+    # counting across calls on a shared instance
+    lines = highlight(code, _lexer(language), _formatter).rstrip('\n').split('\n')
+    width = len(str(len(lines)))
+    return Text.from_ansi('\n'.join(
+        f"\x1b[2m{number:>{width}}\x1b[0m {line}" for number, line in enumerate(lines, 1)
+    ))
+
+
 def get_rag(ctx):
     """Lazy initialization of RAG system"""
     if ctx.obj['rag'] is None:
+        from verba_integration import VerbaCodeRAG
         config = ctx.obj['config']
         ctx.obj['rag'] = VerbaCodeRAG(
             weaviate_url=config['weaviate_url'],
             ollama_url=config['ollama_url'],
             embedding_model=config['embedding_model'],
-            collection_name=config['collection_name']
+            collection_name=config['collection_name'],
+            embed_batch_size=config['embed_batch_size'],
+            embed_concurrency=config['embed_concurrency'],
+            pq_segments=config['pq_segments'],
+            grpc_port=config['grpc_port'],
+            min_chunk_chars=config['min_chunk_chars']
         )
     return ctx.obj['rag']
 
 
 @cli.command()
 @click.argument('file_path', type=click.Path(exists=True))
+@click.option('--force', is_flag=True, help='Re-embed and rewrite chunks even if they are unchanged')
 @click.pass_context
-def index_file(ctx, file_path):
+def index_file(ctx, file_path, force):
     """Index a single code file"""
+    console = _console()
+    
     rag = get_rag(ctx)
     
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console
-    ) as progress:
+    with _progress() as progress:
         task = progress.add_task(f"Indexing {file_path}...", total=None)
         
-        result = rag.index_file(file_path)
+        result = rag.index_file(file_path, force=force)
         
         progress.update(task, completed=True)
     
@@ -96,9 +187,13 @@ def index_file(ctx, file_path):
 @cli.command()
 @click.argument('directory', type=click.Path(exists=True))
 @click.option('--extensions', '-e', multiple=True, default=['.py'], help='File extensions to index')
+@click.option('--workers', '-w', type=int, default=None, help='Processes used for chunking (default: CPU count)')
+@click.option('--full', is_flag=True, help='Re-index every file, not just new and modified ones')
 @click.pass_context
-def index_directory(ctx, directory, extensions):
+def index_directory(ctx, directory, extensions, workers, full):
     """Index all code files in a directory"""
+    console = _console()
+    
     rag = get_rag(ctx)
     
     extensions = list(extensions) if extensions else ['.py']
@@ -106,19 +201,18 @@ def index_directory(ctx, directory, extensions):
     console.print(f"Indexing directory: {directory}")
     console.print(f"Extensions: {', '.join(extensions)}")
     
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console
-    ) as progress:
+    with _progress() as progress:
         task = progress.add_task("Indexing files...", total=None)
         
-        results = rag.index_directory(directory, extensions)
+        results = rag.index_directory(directory, extensions, workers=workers, full=full)
         
         progress.update(task, completed=True)
     
     # Display results
     console.print(f"\n✅ Indexed {results['total_chunks']} chunks from {results['total_files']} files", style="green")
+    if results['skipped_files'] or results['deleted_files']:
+        console.print(f"Skipped {results['skipped_files']} unchanged files, "
+                      f"removed {len(results['deleted_files'])} deleted files")
     
     if results['errors']:
         console.print(f"\n⚠️  {len(results['errors'])} errors occurred:", style="yellow")
@@ -132,52 +226,48 @@ def index_directory(ctx, directory, extensions):
 @click.argument('query')
 @click.option('--limit', '-l', default=5, help='Number of results')
 @click.option('--chunk-type', '-t', multiple=True, help='Filter by chunk type')
+@click.option('--no-cache', is_flag=True, help='Recompute the query embedding instead of reusing a cached one')
+@click.option('--certainty', type=float, default=None, help='Only show results at least this similar (0-1)')
 @click.pass_context
-def search(ctx, query, limit, chunk_type):
+def search(ctx, query, limit, chunk_type, no_cache, certainty):
     """Search for code using semantic similarity"""
+    from rich.console import Group
+    from rich.live import Live
+    from rich.panel import Panel
+    console = _console()
+    
     rag = get_rag(ctx)
     
     chunk_types = list(chunk_type) if chunk_type else None
     
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console
-    ) as progress:
-        task = progress.add_task("Searching...", total=None)
-        
-        results = rag.search(query, limit=limit, chunk_types=chunk_types)
-        
-        progress.update(task, completed=True)
+    console.print(f"\nResults for: '{query}'\n")
     
-    if not results:
+    # Render each result as soon as it arrives instead of waiting for all of them
+    results = rag.search_iter(query, limit=limit, chunk_types=chunk_types,
+                              use_cache=not no_cache, preview_only=True, certainty=certainty)
+    panels = []
+    with Live(Group(), console=console, vertical_overflow="visible") as live:
+        for i, result in enumerate(results, 1):
+            # Create a panel for each result
+            content = _highlight(result['content'], result.get('language') or 'python')
+            
+            title = f"[{i}] {result['chunk_type'].upper()} - {result['file_path']}"
+            if result.get('parent_context'):
+                title += f" (in {result['parent_context']})"
+            
+            panels.append(Panel(
+                content,
+                title=title,
+                subtitle=f"Lines {result['location'].rsplit(':', 1)[1]}",
+                expand=False
+            ))
+            live.update(Group(*panels))
+    
+    if not panels:
         console.print("No results found", style="yellow")
         return
     
-    console.print(f"\nFound {len(results)} results for: '{query}'\n")
-    
-    for i, result in enumerate(results, 1):
-        # Create a panel for each result
-        content = Syntax(
-            result['content'][:300] + ("..." if len(result['content']) > 300 else ""),
-            result.get('language', 'python'),
-            theme="monokai",
-            line_numbers=True,
-            start_line=result.get('start_line', 1)
-        )
-        
-        title = f"[{i}] {result['chunk_type'].upper()} - {result['file_path']}"
-        if result.get('parent_context'):
-            title += f" (in {result['parent_context']})"
-        
-        panel = Panel(
-            content,
-            title=title,
-            subtitle=f"Lines {result['location'].split(':')[1]}",
-            expand=False
-        )
-        
-        console.print(panel)
+    console.print(f"\nFound {len(panels)} results")
 
 
 @cli.command()
@@ -189,28 +279,31 @@ def search(ctx, query, limit, chunk_type):
 @click.pass_context
 def ask(ctx, question, model, context_limit):
     """Ask a question about the codebase"""
+    from rich.live import Live
+    from rich.markdown import Markdown
+    from rich.panel import Panel
+    console = _console()
+    
     rag = get_rag(ctx)
     
     console.print(f"\n❓ Question: {question}\n", style="cyan")
     
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console
-    ) as progress:
-        task = progress.add_task("Generating answer...", total=None)
-        
-        answer = rag.answer_question(question, model=model, context_limit=context_limit)
-        
-        progress.update(task, completed=True)
-    
-    console.print(Panel(answer, title="Answer", border_style="green"))
+    # Stream the answer into the panel token by token
+    answer = ""
+    with Live(Panel("", title="Answer", border_style="green"), console=console,
+              vertical_overflow="visible") as live:
+        for part in rag.answer_question_iter(question, model=model, context_limit=context_limit):
+            answer += part
+            live.update(Panel(Markdown(answer), title="Answer", border_style="green"))
 
 
 @cli.command()
 @click.pass_context
 def stats(ctx):
     """Show statistics about indexed code"""
+    from rich.table import Table
+    console = _console()
+    
     rag = get_rag(ctx)
     
     stats = rag.get_stats()
@@ -238,10 +331,15 @@ def stats(ctx):
 @click.option('--output', '-o', help='Output file for chunks (JSON)')
 def preview_chunks(file_path, output):
     """Preview how a file will be chunked without indexing"""
-    chunker = ASTCodeChunker()
+    from ast_chunker import get_chunker, chunks_to_json_bytes
+    from _chunk_cache import ChunkCache
+    console = _console()
+    
+    # The on-disk chunk cache stands in for the chunker's in-memory one
+    chunker = get_chunker(use_cache=False)
     
     try:
-        chunks = chunker.chunk_file(file_path)
+        chunks = ChunkCache().chunk_file(chunker, file_path)
         
         console.print(f"\n📄 File: {file_path}")
         console.print(f"Generated {len(chunks)} chunks:\n")
@@ -257,17 +355,13 @@ def preview_chunks(file_path, output):
                     console.print(f"    {key}: {value}")
             
             # Show content preview
-            content_preview = chunk.content[:150].replace('\n', ' ')
-            if len(chunk.content) > 150:
-                content_preview += "..."
-            console.print(f"    Preview: {content_preview}", style="dim")
+            console.print(f"    Preview: {chunk.content_oneline}", style="dim")
             console.print()
         
         # Save to file if requested
         if output:
-            chunks_data = [chunk.to_dict() for chunk in chunks]
-            with open(output, 'w') as f:
-                json.dump(chunks_data, f, indent=2)
+            with open(output, 'wb') as f:
+                f.write(chunks_to_json_bytes(chunks))
             console.print(f"✅ Chunks saved to {output}", style="green")
     
     except Exception as e:
@@ -278,7 +372,7 @@ def preview_chunks(file_path, output):
 @click.pass_context
 def test_connection(ctx):
     """Test connections to Weaviate and Ollama"""
-    console.print("Testing connections...\n")
+    click.echo("Testing connections...\n")
     
     config = ctx.obj['config']
     
@@ -287,25 +381,27 @@ def test_connection(ctx):
         import weaviate
         client = weaviate.Client(url=config['weaviate_url'])
         client.schema.get()
-        console.print(f"✅ Weaviate connection: OK ({config['weaviate_url']})", style="green")
+        click.secho(f"✅ Weaviate connection: OK ({config['weaviate_url']})", fg='green')
     except Exception as e:
-        console.print(f"❌ Weaviate connection: FAILED - {e}", style="red")
+        click.secho(f"❌ Weaviate connection: FAILED - {e}", fg='red')
     
     # Test Ollama
     try:
         import ollama
         client = ollama.Client(host=config['ollama_url'])
         models = client.list()
-        console.print(f"✅ Ollama connection: OK ({config['ollama_url']})", style="green")
-        console.print(f"   Available models: {', '.join([m['name'] for m in models['models']])}")
+        click.secho(f"✅ Ollama connection: OK ({config['ollama_url']})", fg='green')
+        click.echo(f"   Available models: {', '.join([m['name'] for m in models['models']])}")
     except Exception as e:
-        console.print(f"❌ Ollama connection: FAILED - {e}", style="red")
+        click.secho(f"❌ Ollama connection: FAILED - {e}", fg='red')
 
 
 @cli.command()
 @click.pass_context
 def init_schema(ctx):
     """Initialize Weaviate schema for code chunks"""
+    console = _console()
+    
     console.print("Initializing Weaviate schema...\n")
     
     try:
@@ -315,42 +411,48 @@ def init_schema(ctx):
         console.print(f"❌ Failed to initialize schema: {e}", style="red")
         sys.exit(1)
 
+async def _pull_models(ollama_url: str, models: list, progress):
+    """Pull several Ollama models concurrently, advancing one progress task per model."""
+    import asyncio
+    import ollama
+    client = ollama.AsyncClient(host=ollama_url)
+    
+    async def pull(model):
+        task = progress.add_task(f"Pulling {model}...", total=None)
+        async for part in await client.pull(model, stream=True):
+            if part.get('total'):
+                progress.update(task, total=part['total'], completed=part.get('completed') or 0,
+                                description=f"{model}: {part.get('status')}")
+            else:
+                progress.update(task, description=f"{model}: {part.get('status')}")
+        progress.update(task, description=f"{model}: done")
+    
+    await asyncio.gather(*(pull(model) for model in models))
+
+
 @cli.command()
 @click.pass_context
 def init_models(ctx):
     """Download required Ollama models"""
+    import asyncio
+    from rich.progress import BarColumn, DownloadColumn
+    console = _console()
+    
     console.print("Downloading required models...\n")
     
     config = ctx.obj['config']
     
     try:
-        import ollama
-        client = ollama.Client(host=config['ollama_url'])
-        
-        # Pull embedding model
         embed_model = config['embedding_model']
+        chat_model = os.environ.get('OLLAMA_CHAT_MODEL', 'llama3.2')
         console.print(f"📥 Downloading embedding model: {embed_model}")
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=console
-        ) as progress:
-            task = progress.add_task(f"Pulling {embed_model}...", total=None)
-            client.pull(embed_model)
-            progress.update(task, completed=True)
-        console.print(f"✅ {embed_model} downloaded", style="green")
+        console.print(f"📥 Downloading chat model: {chat_model}\n")
         
-        # Pull chat model
-        chat_model = os.environ.get('OLLAMA_CHAT_MODEL', 'llama3.2')
-        console.print(f"\n📥 Downloading chat model: {chat_model}")
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=console
-        ) as progress:
-            task = progress.add_task(f"Pulling {chat_model}...", total=None)
-            client.pull(chat_model)
-            progress.update(task, completed=True)
+        # Both pulls are network-bound and independent, so run them concurrently
+        with _progress(BarColumn(), DownloadColumn(), transient=False) as progress:
+            asyncio.run(_pull_models(config['ollama_url'], [embed_model, chat_model], progress))
+        
+        console.print(f"✅ {embed_model} downloaded", style="green")
         console.print(f"✅ {chat_model} downloaded", style="green")
         
     except Exception as e:
@@ -361,44 +463,44 @@ def init_models(ctx):
 @click.pass_context
 def check_services(ctx):
     """Check if required services are running"""
-    console.print("Checking services...\n")
+    import requests
+    click.echo("Checking services...\n")
     
     config = ctx.obj['config']
     services_ok = True
     
-    # Check Weaviate
+    # Check Weaviate; one plain request each, so a service that is down is
+    # reported at once rather than after retries
     try:
-        import requests
         response = requests.get(f"{config['weaviate_url']}/v1/.well-known/ready", timeout=2)
         if response.status_code == 200:
-            console.print("✅ Weaviate: Running", style="green")
+            click.secho("✅ Weaviate: Running", fg='green')
         else:
-            console.print("⚠️  Weaviate: Not ready", style="yellow")
+            click.secho("⚠️  Weaviate: Not ready", fg='yellow')
             services_ok = False
     except:
-        console.print("❌ Weaviate: Not running", style="red")
-        console.print("   Run: flox services start weaviate", style="dim")
+        click.secho("❌ Weaviate: Not running", fg='red')
+        click.secho("   Run: flox services start weaviate", dim=True)
         services_ok = False
     
     # Check Ollama
     try:
-        import requests
         response = requests.get(f"{config['ollama_url']}/api/tags", timeout=2)
         if response.status_code == 200:
-            console.print("✅ Ollama: Running", style="green")
+            click.secho("✅ Ollama: Running", fg='green')
         else:
-            console.print("⚠️  Ollama: Not ready", style="yellow")
+            click.secho("⚠️  Ollama: Not ready", fg='yellow')
             services_ok = False
     except:
-        console.print("❌ Ollama: Not running", style="red")
-        console.print("   Run: flox services start ollama", style="dim")
+        click.secho("❌ Ollama: Not running", fg='red')
+        click.secho("   Run: flox services start ollama", dim=True)
         services_ok = False
     
     if not services_ok:
-        console.print("\n💡 Start all services with: flox services start", style="cyan")
+        click.secho("\n💡 Start all services with: flox services start", fg='cyan')
         sys.exit(1)
     else:
-        console.print("\n✅ All services are running!", style="green")
+        click.secho("\n✅ All services are running!", fg='green')
 
 if __name__ == '__main__':
     cli(obj={})
\ No newline at end of file
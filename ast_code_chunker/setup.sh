@@ -8,7 +8,13 @@ echo "🚀 Setting up AST Code Chunker for Verba RAG..."
 
 # Check if Python is available
 if ! command -v python3 &> /dev/null; then
-    echo "❌ Python 3 is not installed. Please install Python 3.8 or higher."
+    echo "❌ Python 3 is not installed. Please install Python 3.10 or higher."
+    exit 1
+fi
+
+# CodeChunk uses @dataclass(slots=True), which needs Python 3.10
+if ! python3 -c 'import sys; sys.exit(sys.version_info < (3, 10))'; then
+    echo "❌ Python 3.10 or higher is required (found $(python3 --version 2>&1))."
     exit 1
 fi
 
@@ -29,6 +35,15 @@ pip install --upgrade pip
 echo "📚 Installing dependencies..."
 pip install -r requirements.txt
 
+# Compile the search result formatter to a C extension on request
+# (AST_CHUNKER_MYPYC=1). The built .so shadows verba_formatting.py, so it
+# has to be rebuilt or deleted after editing the module
+if [ "${AST_CHUNKER_MYPYC:-0}" = "1" ]; then
+    echo "⚙️  Compiling result formatter with mypyc..."
+    pip install mypy
+    mypyc verba_formatting.py || echo "⚠️  mypyc build failed, using the pure-Python formatter"
+fi
+
 # Make CLI executable
 chmod +x cli.py
 
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Tests for ASTCodeChunker helpers
+"""
+
+import copy
+
+import pytest
+
+from ast_chunker import ASTCodeChunker, _iter_line_blocks
+
+
+LINE_BLOCK_TEXTS = [
+    "", "a", "a\n", "a\nb", "a\nb\n", "a\n\nb\nc\nd\ne\n",
+    "a\r\nb\r\n", "a\r\n\r\nb", "a\rb\rc", "a\r\nb\nc\rd",
+    "a\fb\n", "a\vb", "a\x85b c d", "\r\n",
+]
+
+
+@pytest.mark.parametrize("text", LINE_BLOCK_TEXTS)
+@pytest.mark.parametrize("block_size", [1, 2, 3])
+def test_iter_line_blocks_matches_splitlines(text, block_size):
+    """Line blocks match joining runs of ``splitlines()``, as chunking did before."""
+    lines = text.splitlines()
+    expected = [
+        (i + 1, min(i + block_size, len(lines)), '\n'.join(lines[i:i + block_size]))
+        for i in range(0, len(lines), block_size)
+    ]
+    assert list(_iter_line_blocks(text, block_size)) == expected
+
+
+def test_chunk_file_cache_hands_out_copies(tmp_path):
+    """Editing returned chunks doesn't change what later calls get."""
+    path = tmp_path / "example.py"
+    path.write_text('def greet(name, greeting="Hello"):\n    """Say hello."""\n    return greeting + name\n')
+    chunker = ASTCodeChunker()
+    
+    first = chunker.chunk_file(str(path))
+    expected = copy.deepcopy([chunk.to_dict() for chunk in first])
+    for chunk in first:
+        chunk.content = "edited"
+        chunk.metadata.clear()
+    
+    assert [chunk.to_dict() for chunk in chunker.chunk_file(str(path))] == expected
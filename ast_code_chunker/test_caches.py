@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Tests for the on-disk chunk and embedding caches
+"""
+
+import pytest
+
+from ast_chunker import ASTCodeChunker
+from _chunk_cache import ChunkCache, EmbeddingCache
+
+
+SOURCE = '''"""Example module."""
+
+import os
+
+
+def greet(name):
+    """Say hello."""
+    return f"Hello, {name}"
+'''
+
+
+class CountingChunker(ASTCodeChunker):
+    """Chunker that counts how often it actually parses a file."""
+    
+    def __init__(self):
+        super().__init__(use_cache=False)
+        self.calls = 0
+    
+    def chunk_file(self, file_path):
+        self.calls += 1
+        return super().chunk_file(file_path)
+
+
+@pytest.fixture
+def source_file(tmp_path):
+    path = tmp_path / "example.py"
+    path.write_text(SOURCE)
+    return path
+
+
+def test_chunk_cache_hit_skips_parsing(tmp_path, source_file):
+    """Unchanged contents are served from the cache; edited contents are re-chunked."""
+    cache = ChunkCache(tmp_path / "cache.db")
+    chunker = CountingChunker()
+    
+    first = cache.chunk_file(chunker, str(source_file))
+    second = cache.chunk_file(chunker, str(source_file))
+    assert chunker.calls == 1
+    assert [c.to_dict() for c in second] == [c.to_dict() for c in first]
+    
+    source_file.write_text(SOURCE + "\n\nVALUE = 1\n")
+    third = cache.chunk_file(chunker, str(source_file))
+    assert chunker.calls == 2
+    assert any("VALUE = 1" in c.content for c in third)
+
+
+def test_chunk_cache_keeps_path_spelling(tmp_path, source_file, monkeypatch):
+    """Chunks for a relative and an absolute spelling of a path carry their own file_path."""
+    monkeypatch.chdir(tmp_path)
+    cache = ChunkCache(tmp_path / "cache.db")
+    chunker = CountingChunker()
+    
+    relative = cache.chunk_file(chunker, "example.py")
+    absolute = cache.chunk_file(chunker, str(source_file))
+    
+    assert {c.file_path for c in relative} == {"example.py"}
+    assert {c.file_path for c in absolute} == {str(source_file)}
+
+
+def test_chunk_cache_survives_reopen(tmp_path, source_file):
+    """Entries persist across cache instances on the same database."""
+    chunker = CountingChunker()
+    ChunkCache(tmp_path / "cache.db").chunk_file(chunker, str(source_file))
+    ChunkCache(tmp_path / "cache.db").chunk_file(chunker, str(source_file))
+    assert chunker.calls == 1
+
+
+def test_embedding_cache_roundtrip_and_model_keys(tmp_path):
+    """Vectors round-trip as float32, and keys differ per model."""
+    cache = EmbeddingCache(tmp_path / "cache.db")
+    key = EmbeddingCache.key("model-a", "text")
+    assert key != EmbeddingCache.key("model-b", "text")
+    
+    cache.put_many({key: [0.5, -1.25, 2.0]})
+    assert cache.get_many([key, "missing"]) == {key: [0.5, -1.25, 2.0]}
+
+
+def test_embedding_cache_evicts_least_recently_used(tmp_path):
+    """Beyond max_entries, the least recently used vectors are dropped."""
+    cache = EmbeddingCache(tmp_path / "cache.db", max_entries=2)
+    cache.put_many({"a": [1.0]})
+    cache.put_many({"b": [2.0]})
+    # Touch "a" so "b" becomes the oldest
+    cache.get_many(["a"])
+    cache.put_many({"c": [3.0]})
+    
+    assert set(cache.get_many(["a", "b", "c"])) == {"a", "c"}
+
+
+def test_embedding_cache_many_keys(tmp_path):
+    """Lookups larger than SQLite's bound-parameter limit are split up."""
+    cache = EmbeddingCache(tmp_path / "cache.db")
+    vectors = {f"k{i}": [float(i)] for i in range(1200)}
+    cache.put_many(vectors)
+    assert cache.get_many(vectors) == vectors
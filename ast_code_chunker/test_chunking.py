@@ -3,7 +3,9 @@
 Test script to demonstrate AST-based chunking
 """
 
-from ast_chunker import ASTCodeChunker
+from collections import Counter
+
+from ast_chunker import get_chunker, chunks_to_json_bytes
 import json
 
 def test_chunking():
@@ -13,7 +15,7 @@ def test_chunking():
     print("=" * 60)
     
     # Initialize chunker
-    chunker = ASTCodeChunker(include_context=True)
+    chunker = get_chunker(include_context=True)
     
     # Chunk the test file
     chunks = chunker.chunk_file("test_example.py")
@@ -21,9 +23,7 @@ def test_chunking():
     print(f"✅ Generated {len(chunks)} chunks from test_example.py\n")
     
     # Display chunk statistics
-    chunk_types = {}
-    for chunk in chunks:
-        chunk_types[chunk.chunk_type] = chunk_types.get(chunk.chunk_type, 0) + 1
+    chunk_types = Counter(chunk.chunk_type for chunk in chunks)
     
     print("📊 Chunk Type Distribution:")
     for chunk_type, count in sorted(chunk_types.items()):
@@ -72,9 +72,8 @@ def test_chunking():
     
     # Save chunks to file for inspection
     output_file = "test_chunks.json"
-    chunks_data = [chunk.to_dict() for chunk in chunks]
-    with open(output_file, 'w') as f:
-        json.dump(chunks_data, f, indent=2)
+    with open(output_file, 'wb') as f:
+        f.write(chunks_to_json_bytes(chunks))
     
     print(f"\n💾 Chunks saved to {output_file} for detailed inspection")
     
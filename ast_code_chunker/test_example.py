@@ -11,6 +11,11 @@ from typing import List, Dict, Optional
 from dataclasses import dataclass
 import json
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Global configuration
 DEBUG_MODE = True
 VERSION = "2.0.0"
@@ -67,7 +72,8 @@ class DatabaseConnection:
             raise RuntimeError("Not connected to database")
         
         # Check cache
-        cache_key = f"{query}:{json.dumps(params or {})}"
+        params_key = orjson.dumps(params or {}).decode() if orjson else json.dumps(params or {})
+        cache_key = f"{query}:{params_key}"
         if cache_key in self._cache:
             return self._cache[cache_key]
         
@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Tests for indexing and search in the Verba integration
+
+Weaviate and Ollama are replaced by in-memory fakes, so these run without
+either service.
+"""
+
+import os
+import threading
+
+import pytest
+
+from ast_chunker import CodeChunk, MultiLanguageASTChunker, CHUNK_CLASS, CHUNK_FUNCTION, CHUNK_METHOD
+from _chunk_cache import ChunkCache, EmbeddingCache
+from verba_formatting import format_result
+from verba_integration import VerbaCodeRAG, _split_metadata
+
+
+class FakeBatch:
+    """Stand-in for the weaviate-client v3 batcher."""
+    
+    def __init__(self):
+        self.added = []
+        self.deleted = []
+        self.fail_after = None
+        self.fail_ids = set()
+    
+    def configure(self, batch_size=100, dynamic=True, num_workers=1, callback=None):
+        self.callback = callback
+    
+    def __enter__(self):
+        self.queued = []
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.added.extend(self.queued)
+            self.callback([
+                {"id": obj["uuid"],
+                 "result": {"errors": {"error": [{"message": "rejected"}]}} if obj["uuid"] in self.fail_ids else {}}
+                for obj in self.queued
+            ])
+        return False
+    
+    def add_data_object(self, data_object, class_name, uuid=None, vector=None):
+        if self.fail_after is not None and len(self.queued) >= self.fail_after:
+            raise ConnectionError("connection reset")
+        self.queued.append({"properties": data_object, "uuid": uuid, "vector": vector})
+    
+    def delete_objects(self, class_name, where):
+        self.deleted.append(where["valueString"])
+
+
+class FakeClient:
+    def __init__(self):
+        self.batch = FakeBatch()
+
+
+def fake_embed_batch(texts, batch_size=None):
+    return [[float(len(text)), 1.0] for text in texts]
+
+
+@pytest.fixture
+def rag(tmp_path):
+    """A VerbaCodeRAG wired to fakes, with its caches and manifest under tmp_path."""
+    rag = VerbaCodeRAG.__new__(VerbaCodeRAG)
+    rag.embedding_model = "test-model"
+    rag.collection_name = "CodeChunks"
+    rag.embed_batch_size = 2
+    rag.embed_concurrency = 1
+    rag.min_chunk_chars = 0
+    rag.grpc_client = None
+    rag.client = FakeClient()
+    rag.chunker = MultiLanguageASTChunker(use_cache=False)
+    rag.chunk_cache = ChunkCache(tmp_path / "cache" / "cache.db")
+    rag.embedding_cache = EmbeddingCache(tmp_path / "cache" / "cache.db")
+    rag.embed_batch = fake_embed_batch
+    return rag
+
+
+@pytest.fixture
+def project(tmp_path):
+    """A directory of three small Python files."""
+    directory = tmp_path / "project"
+    directory.mkdir()
+    for name in ("a", "b", "c"):
+        (directory / f"{name}.py").write_text(f"def {name}():\n    return {name!r}\n")
+    return directory
+
+
+def stored_files(rag):
+    return {obj["properties"]["file_path"] for obj in rag.client.batch.added}
+
+
+def make_chunk(file_path, content, chunk_type=CHUNK_FUNCTION, metadata=None):
+    return CodeChunk(
+        id=f"{file_path}:{content}",
+        content=content,
+        chunk_type=chunk_type,
+        file_path=file_path,
+        start_line=1,
+        end_line=1,
+        language="python",
+        metadata=metadata or {}
+    )
+
+
+def test_pack_batches_covers_every_text_once(rag):
+    texts = ["x" * n for n in (5, 1, 300, 40, 2, 7, 90)]
+    batches = rag._pack_batches(texts, batch_size=3)
+    
+    assert sorted(i for batch in batches for i in batch) == list(range(len(texts)))
+    assert all(len(batch) <= 3 for batch in batches)
+    # Batches are filled shortest text first
+    order = [len(texts[i]) for batch in batches for i in batch]
+    assert order == sorted(order)
+
+
+def test_pack_batches_respects_token_budget(rag):
+    budget = rag.EMBED_BATCH_MAX_TOKENS
+    # Two of these fit in a batch, three do not
+    texts = ["y" * (budget * 4 * 2 // 5)] * 4 + ["z" * (budget * 8)]
+    batches = rag._pack_batches(texts, batch_size=32)
+    
+    for batch in batches:
+        tokens = sum(len(texts[i]) // 4 for i in batch)
+        # A single oversized text still gets a batch of its own
+        assert tokens <= budget or len(batch) == 1
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+
+
+def test_pack_batches_empty(rag):
+    assert rag._pack_batches([], batch_size=8) == []
+
+
+def test_index_directory_skips_unchanged_files(rag, project):
+    first = rag.index_directory(str(project), extensions=[".py"], workers=1)
+    assert first["errors"] == []
+    assert first["skipped_files"] == 0
+    assert stored_files(rag) == {str(project / f"{name}.py") for name in "abc"}
+    
+    rag.client.batch.added.clear()
+    second = rag.index_directory(str(project), extensions=[".py"], workers=1)
+    assert second["skipped_files"] == 3
+    assert second["files_processed"] == []
+    assert rag.client.batch.added == []
+
+
+def test_index_directory_reindexes_modified_and_deletes_removed(rag, project):
+    rag.index_directory(str(project), extensions=[".py"], workers=1)
+    rag.client.batch.added.clear()
+    rag.client.batch.deleted.clear()
+    
+    a, b, c = (str(project / f"{name}.py") for name in "abc")
+    (project / "a.py").write_text("def a():\n    return 'edited'\n")
+    os.remove(b)
+    # Touched but not edited: the hash matches, so nothing is re-indexed
+    stat = os.stat(c)
+    os.utime(c, (stat.st_atime, stat.st_mtime + 10))
+    
+    results = rag.index_directory(str(project), extensions=[".py"], workers=1)
+    
+    assert [entry["file_path"] for entry in results["files_processed"]] == [a]
+    assert results["deleted_files"] == [os.path.abspath(b)]
+    assert results["skipped_files"] == 1
+    assert rag.client.batch.deleted == [a, b]
+    assert stored_files(rag) == {a}
+    assert set(rag._load_manifest()) == {os.path.abspath(a), os.path.abspath(c)}
+
+
+def test_index_directory_full_ignores_manifest(rag, project):
+    rag.index_directory(str(project), extensions=[".py"], workers=1)
+    rag.client.batch.added.clear()
+    
+    results = rag.index_directory(str(project), extensions=[".py"], workers=1, full=True)
+    assert results["skipped_files"] == 0
+    assert len(results["files_processed"]) == 3
+
+
+def test_failed_batch_marks_unsent_files_failed(rag, project):
+    """A batch that raises partway leaves every file out of the manifest, sent or not."""
+    rag.client.batch.fail_after = 1
+    results = rag.index_directory(str(project), extensions=[".py"], workers=1)
+    
+    assert any("Batch import failed" in error for error in results["errors"])
+    assert results["total_chunks"] == 0
+    assert rag._load_manifest() == {}
+    
+    # The next run retries all of them
+    rag.client.batch.fail_after = None
+    retry = rag.index_directory(str(project), extensions=[".py"], workers=1)
+    assert retry["errors"] == []
+    assert retry["skipped_files"] == 0
+    assert len(rag._load_manifest()) == 3
+
+
+def test_rejected_object_marks_its_file_failed(rag, project):
+    a = str(project / "a.py")
+    chunks = rag.chunker.chunk_file(a)
+    rag.client.batch.fail_ids = {rag._chunk_uuid(chunk) for chunk in chunks}
+    
+    results = rag.index_directory(str(project), extensions=[".py"], workers=1)
+    
+    assert results["total_chunks"] == len(rag.client.batch.added) - len(chunks)
+    assert set(rag._load_manifest()) == {os.path.abspath(str(project / f"{name}.py")) for name in "bc"}
+
+
+def test_index_directory_without_manifest_deletes_before_writing(rag, project):
+    """Objects stored before there was a manifest are replaced, not duplicated."""
+    rag.index_directory(str(project), extensions=[".py"], workers=1)
+    
+    assert rag.client.batch.deleted == [str(project / f"{name}.py") for name in "abc"]
+
+
+def test_search_preview_falls_back_to_content(rag, monkeypatch):
+    """Hits without a stored content_preview are shown with their full content."""
+    row = {"chunk_type": "function", "file_path": "a.py", "language": "python",
+           "start_line": 1, "end_line": 2, "parent_context": None, "metadata": "{}"}
+    requested = []
+    
+    def near_vector(vector, properties, limit, chunk_types, certainty=None):
+        requested.append(properties[0])
+        return [{**row, properties[0]: None if properties[0] == "content_preview" else "def a(): pass"}]
+    
+    monkeypatch.setattr(rag, "embed_query", lambda query, use_cache=True: [1.0, 0.0])
+    monkeypatch.setattr(rag, "_near_vector", near_vector)
+    results = list(rag.search_iter("a", preview_only=True))
+    
+    assert requested == ["content_preview", "content"]
+    assert [result["content"] for result in results] == ["def a(): pass"]
+
+
+def test_index_chunks_reports_chunks_the_writer_never_took(rag):
+    """If the writer returns early, the remaining chunks are reported, not dropped."""
+    chunks = [make_chunk(f"f{i}.py", f"def f{i}(): pass") for i in range(10)]
+    
+    def store_first(pairs):
+        next(iter(pairs))
+        return 1, [], set()
+    
+    rag._store_chunks = store_first
+    results = rag.index_chunks(chunks)
+    
+    assert results["indexed_chunks"] == 1
+    assert results["errors"] == ["9 chunks were not stored"]
+    assert results["failed_files"] == sorted(f"f{i}.py" for i in range(1, 10))
+    assert not results["success"]
+
+
+def test_failed_batch_stops_embedding(rag):
+    """After a batch import fails, the remaining chunks are not embedded just to be dropped."""
+    chunks = [make_chunk(f"f{i}.py", f"def f{i}(): pass") for i in range(50)]
+    embedded = []
+    
+    def embed_batch(texts, batch_size=None):
+        embedded.extend(texts)
+        return fake_embed_batch(texts)
+    
+    rag.embed_batch = embed_batch
+    rag.client.batch.fail_after = 0
+    results = rag.index_chunks(chunks)
+    
+    assert len(embedded) < len(chunks)
+    assert results["indexed_chunks"] == 0
+    assert results["failed_files"] == sorted(chunk.file_path for chunk in chunks)
+
+
+def test_store_error_stops_the_producer(rag):
+    """An exception from the writer propagates and doesn't leave the producer blocked."""
+    chunks = [make_chunk(f"f{i}.py", f"def f{i}(): pass") for i in range(50)]
+    
+    def configure(**kwargs):
+        raise ConnectionError("weaviate is down")
+    
+    rag.client.batch.configure = configure
+    with pytest.raises(ConnectionError):
+        rag.index_chunks(chunks)
+    assert not any(thread.name == "embed-producer" for thread in threading.enumerate())
+
+
+def test_query_embeddings_use_the_batch_endpoint(rag, monkeypatch):
+    """Queries are embedded through /api/embed, like chunks, and land in the same cache."""
+    requests = []
+    
+    def embed_request(batch):
+        requests.append(batch)
+        return fake_embed_batch(batch)
+    
+    rag.ollama_client = None
+    monkeypatch.setattr(rag, "_embed_request", embed_request)
+    query = "where is the query embedding test?"
+    
+    assert rag.embed_query(query) == [float(len(query)), 1.0]
+    assert rag.embed_query(query, use_cache=False) == [float(len(query)), 1.0]
+    assert requests == [[query], [query]]
+    key = EmbeddingCache.key(rag.embedding_model, query)
+    assert rag.embedding_cache.get_many([key]) == {key: [float(len(query)), 1.0]}
+
+
+def test_index_chunks_skips_small_chunks(rag):
+    rag.min_chunk_chars = 10
+    chunks = [make_chunk("a.py", "x = 1"), make_chunk("a.py", "def long_enough(): pass")]
+    
+    results = rag.index_chunks(chunks)
+    
+    assert results["small_chunks"] == 1
+    assert results["indexed_chunks"] == 1
+    assert results["success"]
+
+
+def test_split_metadata_types_known_keys():
+    method = make_chunk("a.py", "def m(self): pass", CHUNK_METHOD,
+                        {"method_name": "m", "class_name": "A", "num_args": 1, "decorators": ["staticmethod"]})
+    typed, extras = _split_metadata(method)
+    assert typed == {"name": "m", "class_name": "A", "num_args": 1}
+    assert extras == {"decorators": ["staticmethod"]}
+    
+    cls = make_chunk("a.py", "class A: pass", CHUNK_CLASS, {"class_name": "A", "num_methods": 0})
+    typed, extras = _split_metadata(cls)
+    assert typed == {"name": "A", "class_name": "A", "num_methods": 0}
+    assert extras == {}
+
+
+def test_format_result_roundtrips_metadata(rag, project):
+    """Stored properties read back with the chunk's original metadata keys."""
+    (project / "d.py").write_text(
+        '"""Module docstring."""\n\n\nclass A:\n    """Doc."""\n\n    def m(self, x):\n        return x\n'
+    )
+    chunks = rag.chunker.chunk_file(str(project / "d.py"))
+    assert {chunk.chunk_type for chunk in chunks} >= {CHUNK_CLASS, CHUNK_METHOD}
+    for chunk in chunks:
+        properties = VerbaCodeRAG._chunk_properties(chunk, "2024-01-01T00:00:00")
+        result = format_result(properties, "content")
+        for key, value in chunk.metadata.items():
+            assert result["metadata"][key] == value
+        assert result["location"] == f"{chunk.file_path}:{chunk.start_line}-{chunk.end_line}"
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Search result formatting for the Verba integration
+
+Turns the objects Weaviate returns into the result dicts handed out by
+``VerbaCodeRAG.search``. The module is fully annotated, so it can be
+compiled to a C extension with ``mypyc verba_formatting.py``; the compiled
+module is then imported in place of this file, and nothing else changes.
+Compiling is opt-in (see setup.sh): the extension must be rebuilt, or
+deleted, after editing this file, or the edits are silently ignored.
+"""
+
+import json
+from typing import Any, Dict, Optional, Tuple
+
+from ast_chunker import CHUNK_FUNCTION, CHUNK_METHOD, CHUNK_MODULE_DOCSTRING
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+
+# Chunk metadata stored as typed Weaviate properties, so it can be filtered
+# on server-side and read without JSON parsing; other keys stay in the
+# "metadata" JSON property
+METADATA_PROPERTIES: Dict[str, Tuple[str, str]] = {
+    "name": ("string", "Name of the function, method, class or module"),
+    "class_name": ("string", "Enclosing class of a method, or the class itself"),
+    "has_docstring": ("boolean", "Whether the definition has a docstring"),
+    "is_private": ("boolean", "Whether the name starts with an underscore"),
+    "is_dunder": ("boolean", "Whether the method is a __dunder__ method"),
+    "num_args": ("int", "Number of function arguments"),
+    "num_methods": ("int", "Number of methods in the class"),
+}
+
+
+# Keys the Python chunker uses for a chunk's name, which is stored as the
+# typed "name" property; results report it under both, so consumers of
+# the original keys keep working
+LEGACY_NAME_KEYS: Dict[str, str] = {
+    CHUNK_FUNCTION: "function_name",
+    CHUNK_METHOD: "method_name",
+    CHUNK_MODULE_DOCSTRING: "module",
+}
+
+
+def dumps_metadata(metadata: Dict[str, Any]) -> str:
+    """Serialize chunk metadata for storage, via orjson when available."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(metadata).decode('utf-8')
+        except TypeError:
+            # e.g. non-string keys, which json coerces but orjson rejects
+            pass
+    return json.dumps(metadata)
+
+
+def loads_metadata(metadata: Optional[str]) -> Dict[str, Any]:
+    """Parse stored chunk metadata, via orjson when available."""
+    if not metadata or metadata == "{}":
+        return {}
+    if orjson is not None:
+        return orjson.loads(metadata)
+    return json.loads(metadata)
+
+
+def format_result(chunk: Dict[str, Any], content_field: str) -> Dict[str, Any]:
+    """
+    Format one Weaviate search hit as a search result.
+    
+    Args:
+        chunk: Properties of the matching object
+        content_field: Property holding the code (``content`` or ``content_preview``)
+    
+    Returns:
+        Result dict with content, location and merged metadata
+    """
+    # Typed fields are read as-is; only leftover keys need parsing
+    metadata = loads_metadata(chunk.get("metadata"))
+    for key in METADATA_PROPERTIES:
+        value = chunk.get(key)
+        if value is not None:
+            metadata[key] = value
+    legacy_key = LEGACY_NAME_KEYS.get(chunk["chunk_type"])
+    if legacy_key is not None and chunk["language"] == "python" and "name" in metadata:
+        metadata.setdefault(legacy_key, metadata["name"])
+    
+    file_path: str = chunk["file_path"]
+    return {
+        "content": chunk[content_field] or "",
+        "chunk_type": chunk["chunk_type"],
+        "file_path": file_path,
+        "language": chunk["language"],
+        "location": f"{file_path}:{chunk['start_line']}-{chunk['end_line']}",
+        "parent_context": chunk.get("parent_context"),
+        "metadata": metadata
+    }
@@ -8,21 +8,120 @@ providing code-aware document processing and retrieval.
 
 import os
 import json
+import queue
+import atexit
 import logging
+import threading
+import hashlib
+import tempfile
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple, Iterable, Iterator
 from datetime import datetime
+from urllib.parse import urlparse
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import weaviate
 from weaviate.embedded import EmbeddedOptions
+from weaviate.util import generate_uuid5
 import ollama
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-from ast_chunker import ASTCodeChunker, MultiLanguageASTChunker, CodeChunk
+try:
+    # Present only in weaviate-client v4, whose collections API talks gRPC
+    from weaviate.classes.query import Filter
+except ImportError:
+    Filter = None
+
+from ast_chunker import ASTCodeChunker, MultiLanguageASTChunker, CodeChunk, CHUNK_CLASS
+from _chunk_cache import ChunkCache, EmbeddingCache
+from verba_formatting import METADATA_PROPERTIES, dumps_metadata, format_result
 
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def _pooled_session(concurrency: int) -> requests.Session:
+    """
+    HTTP session for Ollama embedding requests.
+    
+    Pools enough keep-alive connections for ``concurrency`` requests in
+    flight, and retries dropped connections instead of failing the batch.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_maxsize=max(10, concurrency),
+                          max_retries=Retry(total=3, backoff_factor=0.1))
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+# Query embeddings shared by every VerbaCodeRAG in the process, least
+# recently used first, keyed by EmbeddingCache.key(model, text) so a model
+# change never serves a stale vector
+_QUERY_EMBEDDINGS: "OrderedDict[str, Tuple[float, ...]]" = OrderedDict()
+_QUERY_EMBEDDINGS_SIZE = 1024
+_query_embeddings_lock = threading.Lock()
+
+
+# Metadata keys the chunkers use for a chunk's own name
+_NAME_KEYS = ("function_name", "method_name", "name", "module")
+
+
+def _split_metadata(chunk: CodeChunk) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Split a chunk's metadata into typed property values and the remaining JSON extras."""
+    typed = {}
+    extras = {}
+    for key, value in chunk.metadata.items():
+        if key in _NAME_KEYS:
+            typed["name"] = value
+        elif key in METADATA_PROPERTIES:
+            typed[key] = value
+        else:
+            extras[key] = value
+    if "name" not in typed and chunk.chunk_type == CHUNK_CLASS and "class_name" in typed:
+        typed["name"] = typed["class_name"]
+    return typed, extras
+
+
+# LLM context layout: the header, then one block per retrieved chunk
+_CONTEXT_HEADER = "Here are the relevant code sections:\n"
+_CONTEXT_CHUNK_TPL = (
+    "\n--- Code Chunk {i} ---\n"
+    "File: {file_path}\n"
+    "Type: {chunk_type}\n"
+    "{context}"
+    "Location: Lines {lines}\n"
+    "\n```{language}\n"
+    "{code}\n"
+    "```\n"
+)
+
+
+# Chunker owned by each index_directory worker process
+_worker_chunker = None
+
+
+def _init_chunk_worker():
+    """ProcessPoolExecutor initializer: give the worker its own chunker."""
+    global _worker_chunker
+    _worker_chunker = MultiLanguageASTChunker(use_cache=False)
+
+
+def _chunk_one(chunker, file_path: str) -> Tuple[List[CodeChunk], Optional[str]]:
+    """Chunk a single file, returning (chunks, error message or None)."""
+    try:
+        return chunker.chunk_file(file_path), None
+    except Exception as e:
+        return [], str(e)
+
+
+def _chunk_file_in_worker(file_path: str) -> Tuple[List[CodeChunk], Optional[str]]:
+    return _chunk_one(_worker_chunker, file_path)
+
+
 class VerbaCodeRAG:
     """
     Integration layer between AST code chunker and Verba RAG system.
@@ -34,11 +133,27 @@ class VerbaCodeRAG:
     - Semantic code search and retrieval
     """
     
+    # Weaviate batch import settings (objects per request, concurrent requests)
+    WRITE_BATCH_SIZE = 100
+    WRITE_WORKERS = 4
+    
+    # Upper bound on estimated tokens per Ollama /api/embed request
+    EMBED_BATCH_MAX_TOKENS = 8192
+    
+    # Embedded groups that may wait for the writer before embedding pauses
+    PIPELINE_DEPTH = 4
+    
     def __init__(self, 
                  weaviate_url: str = "http://localhost:8080",
                  ollama_url: str = "http://localhost:11434",
                  embedding_model: str = "mxbai-embed-large",
-                 collection_name: str = "CodeChunks"):
+                 collection_name: str = "CodeChunks",
+                 embed_batch_size: int = 32,
+                 embed_concurrency: int = 4,
+                 session: Optional[requests.Session] = None,
+                 pq_segments: int = 0,
+                 grpc_port: int = 0,
+                 min_chunk_chars: int = 20):
         """
         Initialize Verba Code RAG integration.
         
@@ -47,17 +162,40 @@ class VerbaCodeRAG:
             ollama_url: URL of Ollama instance
             embedding_model: Ollama model to use for embeddings
             collection_name: Weaviate collection name for code chunks
+            embed_batch_size: Number of texts sent per Ollama /api/embed request
+            embed_concurrency: Number of embedding requests kept in flight at once
+            session: HTTP session for Ollama batch requests, so connections are
+                kept alive and reused across batches (a new one by default)
+            pq_segments: Enable Weaviate product quantization with this many
+                segments when creating the collection (0 keeps full float
+                vectors; must divide the embedding dimension, e.g. 128 for 1024)
+            grpc_port: Weaviate gRPC port; when set, inserts and searches go
+                through a weaviate-client v4 connection instead of REST
+                (experimental; schema and admin calls stay on REST)
+            min_chunk_chars: Chunks shorter than this, ignoring surrounding
+                whitespace, are not embedded or stored (0 keeps everything)
         """
         self.weaviate_url = weaviate_url
         self.ollama_url = ollama_url
         self.embedding_model = embedding_model
         self.collection_name = collection_name
+        self.embed_batch_size = embed_batch_size
+        self.embed_concurrency = embed_concurrency
+        self.pq_segments = pq_segments
+        self.grpc_port = grpc_port
+        self.min_chunk_chars = min_chunk_chars
+        self.session = session if session is not None else _pooled_session(embed_concurrency)
         
-        # Initialize chunker
-        self.chunker = MultiLanguageASTChunker()
+        # Initialize chunker, with an on-disk cache so unchanged files aren't
+        # re-parsed; that cache replaces the chunker's in-memory one
+        self.chunker = MultiLanguageASTChunker(use_cache=False)
+        self.chunk_cache = ChunkCache()
+        # ...and one for embeddings, so unchanged chunks aren't re-embedded
+        self.embedding_cache = EmbeddingCache()
         
-        # Initialize Weaviate client
+        # Initialize Weaviate client, plus the gRPC data-plane client if enabled
         self.client = self._init_weaviate()
+        self.grpc_client = self._init_weaviate_grpc() if grpc_port else None
         
         # Initialize Ollama client
         self.ollama_client = ollama.Client(host=ollama_url)
@@ -77,17 +215,46 @@ class VerbaCodeRAG:
             logger.error(f"Failed to connect to Weaviate: {e}")
             raise
     
+    def _init_weaviate_grpc(self):
+        """Open a weaviate-client v4 connection to the same instance for gRPC inserts and searches."""
+        if Filter is None:
+            raise ImportError("grpc_port requires weaviate-client v4 (pip install 'weaviate-client>=4.4,<4.10')")
+        url = urlparse(self.weaviate_url)
+        secure = url.scheme == "https"
+        try:
+            client = weaviate.connect_to_custom(
+                http_host=url.hostname,
+                http_port=url.port or (443 if secure else 80),
+                http_secure=secure,
+                grpc_host=url.hostname,
+                grpc_port=self.grpc_port,
+                grpc_secure=secure
+            )
+        except Exception as e:
+            logger.error(f"Failed to connect to Weaviate over gRPC: {e}")
+            raise
+        atexit.register(client.close)
+        return client
+    
     def _create_collection(self):
         """Create Weaviate collection for code chunks if it doesn't exist."""
+        # Embeddings are supplied as each object's vector, so there is no
+        # vectorizer module and no property holding a second copy
         schema = {
             "class": self.collection_name,
             "description": "Collection for AST-based code chunks",
+            "vectorizer": "none",
             "properties": [
                 {
                     "name": "content",
                     "dataType": ["text"],
                     "description": "The code chunk content"
                 },
+                {
+                    "name": "content_preview",
+                    "dataType": ["text"],
+                    "description": "First 300 characters of the content, for result listings"
+                },
                 {
                     "name": "chunk_type",
                     "dataType": ["string"],
@@ -118,15 +285,11 @@ class VerbaCodeRAG:
                     "dataType": ["string"],
                     "description": "Parent context (e.g., class name for methods)"
                 },
+                *self._metadata_properties(),
                 {
                     "name": "metadata",
                     "dataType": ["text"],
-                    "description": "Additional metadata as JSON"
-                },
-                {
-                    "name": "embedding",
-                    "dataType": ["number[]"],
-                    "description": "Vector embedding of the code chunk"
+                    "description": "Remaining metadata as JSON"
                 },
                 {
                     "name": "indexed_at",
@@ -136,6 +299,15 @@ class VerbaCodeRAG:
             ]
         }
         
+        # Weaviate normalizes vectors itself for cosine distance (and then
+        # compares them with a SIMD dot product), so embeddings are stored as
+        # Ollama returns them rather than normalized client-side
+        schema["vectorIndexConfig"] = {"distance": "cosine"}
+        if self.pq_segments:
+            # Compress vectors server-side: HNSW keeps PQ codes in memory instead
+            # of full float32 vectors, for a small recall cost
+            schema["vectorIndexConfig"]["pq"] = {"enabled": True, "segments": self.pq_segments}
+        
         try:
             # Check if collection exists
             existing_classes = self.client.schema.get()
@@ -146,10 +318,26 @@ class VerbaCodeRAG:
                 logger.info(f"Created Weaviate collection: {self.collection_name}")
             else:
                 logger.info(f"Collection {self.collection_name} already exists")
+                # Collections created by older versions lack properties added
+                # since (content_preview, the typed metadata fields)
+                existing = next(c for c in existing_classes['classes'] if c['class'] == self.collection_name)
+                have = {prop['name'] for prop in existing.get('properties', [])}
+                for prop in schema["properties"]:
+                    if prop["name"] not in have:
+                        self.client.schema.property.create(self.collection_name, prop)
+                        logger.info(f"Added property {prop['name']} to {self.collection_name}")
         except Exception as e:
             logger.error(f"Failed to create collection: {e}")
             raise
     
+    @staticmethod
+    def _metadata_properties() -> List[Dict[str, Any]]:
+        """Schema entries for the typed metadata properties."""
+        return [
+            {"name": name, "dataType": [data_type], "description": description}
+            for name, (data_type, description) in METADATA_PROPERTIES.items()
+        ]
+    
     def generate_embedding(self, text: str) -> List[float]:
         """
         Generate embedding for text using Ollama.
@@ -170,12 +358,193 @@ class VerbaCodeRAG:
             logger.error(f"Failed to generate embedding: {e}")
             return []
     
-    def index_file(self, file_path: str) -> Dict[str, Any]:
+    def embed_query(self, text: str, use_cache: bool = True) -> List[float]:
+        """
+        Generate the embedding for a search query.
+        
+        Query embeddings are memoized in-process and in the on-disk embedding
+        cache, so repeating a query (or asking about it), even from a separate
+        CLI run, skips the Ollama round trip. Queries go through /api/embed,
+        like chunks, so both share one cache without mixing endpoints.
+        
+        Args:
+            text: Query text
+            use_cache: Set to False to always ask Ollama
+            
+        Returns:
+            Embedding vector (empty on failure)
+        """
+        if not use_cache:
+            return self._embed_request([text])[0]
+        
+        key = EmbeddingCache.key(self.embedding_model, text)
+        with _query_embeddings_lock:
+            vector = _QUERY_EMBEDDINGS.get(key)
+            if vector is not None:
+                _QUERY_EMBEDDINGS.move_to_end(key)
+                return list(vector)
+        
+        try:
+            vector = tuple(self._embed_query_uncached(key, text))
+        except Exception as e:
+            # Failures are not cached, so the next call tries again
+            logger.error(f"Failed to generate embedding: {e}")
+            return []
+        
+        with _query_embeddings_lock:
+            _QUERY_EMBEDDINGS[key] = vector
+            _QUERY_EMBEDDINGS.move_to_end(key)
+            if len(_QUERY_EMBEDDINGS) > _QUERY_EMBEDDINGS_SIZE:
+                _QUERY_EMBEDDINGS.popitem(last=False)
+        return list(vector)
+    
+    def _embed_query_uncached(self, key: str, text: str) -> List[float]:
+        """Embed a query via the on-disk embedding cache, falling back to Ollama (errors propagate)."""
+        cached = self.embedding_cache.get_many([key])
+        if key in cached:
+            return cached[key]
+        
+        vector = self._embed_request([text])[0]
+        if not vector:
+            raise RuntimeError("Ollama returned no embedding")
+        self.embedding_cache.put_many({key: vector})
+        return vector
+    
+    def embed_cached(self, texts: List[str], refresh: bool = False) -> List[List[float]]:
+        """
+        Generate embeddings for many texts, reusing cached vectors where possible.
+        
+        Texts already embedded with the current model are served from the
+        embedding cache; the rest (each distinct text once) go through
+        ``embed_batch`` and successful results are cached.
+        
+        Args:
+            texts: Texts to embed
+            refresh: Embed every text again and overwrite its cached vector
+            
+        Returns:
+            Embedding vectors in the same order as ``texts`` (empty on failure)
+        """
+        keys = [EmbeddingCache.key(self.embedding_model, text) for text in texts]
+        vectors = {} if refresh else self.embedding_cache.get_many(keys)
+        
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in vectors:
+                missing.setdefault(key, text)
+        
+        if missing:
+            fresh = dict(zip(missing, self.embed_batch(list(missing.values()))))
+            fresh = {key: vector for key, vector in fresh.items() if vector}
+            self.embedding_cache.put_many(fresh)
+            vectors.update(fresh)
+        
+        logger.debug(f"Embedding cache: {len(texts) - len(missing)} of {len(texts)} texts were hits")
+        return [vectors.get(key, []) for key in keys]
+    
+    def embed_batch(self, texts: List[str], batch_size: Optional[int] = None) -> List[List[float]]:
+        """
+        Generate embeddings for many texts using Ollama's batch endpoint.
+        
+        Texts are sorted by length and packed greedily into batches of at
+        most ``batch_size`` texts and ``EMBED_BATCH_MAX_TOKENS``
+        estimated tokens, so one long class body doesn't share a request with
+        dozens of one-liners. Up to ``embed_concurrency`` batches are in
+        flight at once, so Ollama isn't left idle between round trips.
+        
+        Requires Ollama 0.3 or newer for /api/embed; older servers are
+        handled by a per-text fallback.
+        
+        Args:
+            texts: Texts to embed
+            batch_size: Maximum texts per request (defaults to ``embed_batch_size``)
+            
+        Returns:
+            Embedding vectors in the same order as ``texts`` (empty on failure)
+        """
+        embeddings = [None] * len(texts)
+        batches = self._pack_batches(texts, batch_size or self.embed_batch_size)
+        
+        def embed(indices):
+            return indices, self._embed_request([texts[i] for i in indices])
+        
+        if self.embed_concurrency > 1 and len(batches) > 1:
+            with ThreadPoolExecutor(max_workers=min(self.embed_concurrency, len(batches))) as executor:
+                results = list(executor.map(embed, batches))
+        else:
+            results = map(embed, batches)
+        
+        for indices, batch_embeddings in results:
+            for i, embedding in zip(indices, batch_embeddings):
+                embeddings[i] = embedding
+        
+        return embeddings
+    
+    def _embed_request(self, batch: List[str]) -> List[List[float]]:
+        """
+        Embed one batch with a single POST to /api/embed.
+        
+        If the response has no ``embeddings`` (e.g. an Ollama without
+        /api/embed), falls back to one /api/embeddings call per text.
+        """
+        try:
+            response = self.session.post(
+                f"{self.ollama_url}/api/embed",
+                json={"model": self.embedding_model, "input": batch},
+                timeout=60
+            )
+            batch_embeddings = response.json().get("embeddings")
+        except Exception as e:
+            logger.warning(f"Batch embedding failed, falling back to per-text requests: {e}")
+            batch_embeddings = None
+        
+        if not batch_embeddings or len(batch_embeddings) != len(batch):
+            batch_embeddings = [self.generate_embedding(text) for text in batch]
+        
+        return batch_embeddings
+    
+    def _pack_batches(self, texts: List[str], batch_size: int) -> List[List[int]]:
+        """
+        Group text indices into embedding batches of similar length.
+        
+        Returns:
+            Lists of indices into ``texts``; every index appears exactly once
+        """
+        batches = []
+        batch = []
+        batch_tokens = 0
+        
+        for i in sorted(range(len(texts)), key=lambda i: len(texts[i])):
+            # Rough token estimate: ~4 characters per token
+            tokens = len(texts[i]) // 4
+            if batch and (len(batch) >= batch_size
+                          or batch_tokens + tokens > self.EMBED_BATCH_MAX_TOKENS):
+                batches.append(batch)
+                batch = []
+                batch_tokens = 0
+            batch.append(i)
+            batch_tokens += tokens
+        
+        if batch:
+            batches.append(batch)
+        
+        if batches and logger.isEnabledFor(logging.DEBUG):
+            sizes = [len(b) for b in batches]
+            logger.debug(f"Packed {len(texts)} texts into {len(batches)} embedding batches "
+                         f"(sizes min={min(sizes)} max={max(sizes)} mean={len(texts) / len(batches):.1f})")
+        
+        return batches
+    
+    def index_file(self, file_path: str, force: bool = False) -> Dict[str, Any]:
         """
         Index a code file using AST-based chunking.
         
+        Chunks whose object already exists in Weaviate are skipped, and objects
+        left over from an older version of the file are deleted.
+        
         Args:
             file_path: Path to the code file
+            force: Re-embed and rewrite every chunk, even unchanged ones
             
         Returns:
             Dictionary with indexing results
@@ -184,53 +553,26 @@ class VerbaCodeRAG:
         
         try:
             # Chunk the file
-            chunks = self.chunker.chunk_file(file_path)
+            chunks = self.chunk_cache.chunk_file(self.chunker, file_path)
             logger.info(f"Generated {len(chunks)} chunks from {file_path}")
             
-            # Index each chunk
-            indexed_count = 0
-            errors = []
+            uuids = {self._chunk_uuid(chunk): chunk for chunk in chunks}
+            existing = self._stored_uuids(file_path)
+            stale = existing - uuids.keys()
+            for uuid in stale:
+                self.client.data_object.delete(uuid, class_name=self.collection_name)
             
-            for chunk in chunks:
-                try:
-                    # Generate embedding
-                    embedding = self.generate_embedding(chunk.content)
-                    
-                    if not embedding:
-                        errors.append(f"Failed to generate embedding for chunk {chunk.id}")
-                        continue
-                    
-                    # Prepare data for Weaviate
-                    data_object = {
-                        "content": chunk.content,
-                        "chunk_type": chunk.chunk_type,
-                        "file_path": chunk.file_path,
-                        "language": chunk.language,
-                        "start_line": chunk.start_line,
-                        "end_line": chunk.end_line,
-                        "parent_context": chunk.parent_context or "",
-                        "metadata": json.dumps(chunk.metadata),
-                        "embedding": embedding,
-                        "indexed_at": datetime.utcnow().isoformat()
-                    }
-                    
-                    # Add to Weaviate
-                    self.client.data_object.create(
-                        data_object=data_object,
-                        class_name=self.collection_name
-                    )
-                    
-                    indexed_count += 1
-                    
-                except Exception as e:
-                    errors.append(f"Failed to index chunk {chunk.id}: {str(e)}")
+            pending = list(uuids.values()) if force else [
+                chunk for uuid, chunk in uuids.items() if uuid not in existing
+            ]
+            result = self.index_chunks(pending, force=force)
             
             return {
                 "file_path": file_path,
+                **result,
                 "total_chunks": len(chunks),
-                "indexed_chunks": indexed_count,
-                "errors": errors,
-                "success": len(errors) == 0
+                "skipped_chunks": len(chunks) - len(pending),
+                "deleted_chunks": len(stale)
             }
             
         except Exception as e:
@@ -243,13 +585,320 @@ class VerbaCodeRAG:
                 "success": False
             }
     
-    def index_directory(self, directory_path: str, extensions: List[str] = None) -> Dict[str, Any]:
+    def index_chunks(self, chunks: List[CodeChunk], force: bool = False) -> Dict[str, Any]:
+        """
+        Embed and store already-chunked code.
+        
+        Args:
+            chunks: Code chunks to index, possibly from many files
+            force: Re-embed every chunk instead of reusing cached embeddings
+            
+        Returns:
+            Dictionary with indexing results
+        """
+        # Chunks too small to be worth a vector (blank docstrings, lone
+        # statements) would only cost an embedding and a row
+        total_chunks = len(chunks)
+        chunks = [chunk for chunk in chunks if len(chunk.content.strip()) >= self.min_chunk_chars]
+        if len(chunks) < total_chunks:
+            logger.debug(f"Skipping {total_chunks - len(chunks)} chunks under {self.min_chunk_chars} characters")
+        
+        # Embed groups of chunks on a producer thread while this thread
+        # writes the finished ones, so Ollama and Weaviate work overlap
+        group_size = self.embed_batch_size * self.embed_concurrency
+        embedded = queue.Queue(maxsize=self.PIPELINE_DEPTH)
+        stop = threading.Event()
+        producer_error = []
+        # Chunks handed to the writer so far, and whether the producer's
+        # end-of-stream marker has been read
+        delivered = [0]
+        finished = [False]
+        
+        def produce():
+            try:
+                for start in range(0, len(chunks), group_size):
+                    if stop.is_set():
+                        break
+                    group = chunks[start:start + group_size]
+                    embeddings = self.embed_cached([chunk.content for chunk in group], refresh=force)
+                    embedded.put(list(zip(group, embeddings)))
+            except Exception as e:
+                producer_error.append(e)
+            finally:
+                embedded.put(None)
+        
+        def consume():
+            while (pairs := embedded.get()) is not None:
+                for pair in pairs:
+                    delivered[0] += 1
+                    yield pair
+            finished[0] = True
+        
+        producer = threading.Thread(target=produce, name="embed-producer", daemon=True)
+        producer.start()
+        try:
+            indexed_count, errors, failed_files = self._store_chunks(consume())
+        finally:
+            # If the writer stopped early or raised, stop embedding and unblock the producer
+            stop.set()
+            if not finished[0]:
+                while embedded.get() is not None:
+                    pass
+            producer.join()
+        if producer_error:
+            raise producer_error[0]
+        
+        # Anything the writer never received was not stored
+        unsent = chunks[delivered[0]:]
+        if unsent:
+            errors.append(f"{len(unsent)} chunks were not stored")
+            failed_files.update(chunk.file_path for chunk in unsent)
+        
+        return {
+            "total_chunks": total_chunks,
+            "indexed_chunks": indexed_count,
+            "small_chunks": total_chunks - len(chunks),
+            "errors": errors,
+            "failed_files": sorted(failed_files),
+            "success": len(errors) == 0
+        }
+    
+    def _store_chunks(self, pairs: Iterable[Tuple[CodeChunk, List[float]]]) -> Tuple[int, List[str], set]:
+        """
+        Store chunks with their precomputed embeddings in Weaviate.
+        
+        Objects are sent through the client's dynamic batcher, so a directory
+        index costs a request per batch rather than per chunk. Each object
+        gets a deterministic UUID (see ``_chunk_uuid``), so re-indexing a
+        file overwrites its chunks instead of duplicating them. The embedding
+        is stored only as the object's vector, not repeated as a property.
+        
+        If the batch import fails, the rest of ``pairs`` is left unconsumed;
+        ``index_chunks`` reports those chunks as not stored.
+        
+        Args:
+            pairs: (chunk, embedding) pairs, consumed as they become available
+        
+        Returns:
+            Tuple of (number of chunks indexed, error messages, paths of files
+            with at least one chunk that failed to index)
+        """
+        if self.grpc_client is not None:
+            return self._store_chunks_grpc(pairs)
+        
+        errors = []
+        failed_files = set()
+        pending = {}
+        # One timestamp for the whole batch rather than a clock read per chunk
+        indexed_at = datetime.utcnow().isoformat()
+        failed_objects = [0]
+        
+        def collect_errors(results):
+            for result in results or []:
+                item_errors = (result.get("result") or {}).get("errors")
+                if not item_errors:
+                    continue
+                failed_objects[0] += 1
+                chunk = pending.get(result.get("id"))
+                messages = "; ".join(e.get("message", "") for e in item_errors.get("error", []))
+                if chunk is not None:
+                    errors.append(f"Failed to index chunk {chunk.id}: {messages}")
+                    failed_files.add(chunk.file_path)
+                else:
+                    errors.append(f"Failed to index object {result.get('id')}: {messages}")
+        
+        self.client.batch.configure(
+            batch_size=self.WRITE_BATCH_SIZE,
+            dynamic=True,
+            num_workers=self.WRITE_WORKERS,
+            callback=collect_errors
+        )
+        
+        try:
+            with self.client.batch as batch:
+                for chunk, embedding in pairs:
+                    if not embedding:
+                        errors.append(f"Failed to generate embedding for chunk {chunk.id}")
+                        failed_files.add(chunk.file_path)
+                        continue
+                    
+                    uuid = self._chunk_uuid(chunk)
+                    pending[uuid] = chunk
+                    batch.add_data_object(
+                        data_object=self._chunk_properties(chunk, indexed_at),
+                        class_name=self.collection_name,
+                        uuid=uuid,
+                        vector=embedding
+                    )
+        except Exception as e:
+            # We can't tell which batches made it, so count the whole lot as failed
+            errors.append(f"Batch import failed: {str(e)}")
+            failed_files.update(chunk.file_path for chunk in pending.values())
+            failed_objects[0] = len(pending)
+        
+        indexed_count = len(pending) - failed_objects[0]
+        
+        return indexed_count, errors, failed_files
+    
+    def _store_chunks_grpc(self, pairs: Iterable[Tuple[CodeChunk, List[float]]]) -> Tuple[int, List[str], set]:
+        """``_store_chunks`` over the v4 client's gRPC batch stream."""
+        errors = []
+        failed_files = set()
+        pending = {}
+        # One timestamp for the whole batch rather than a clock read per chunk
+        indexed_at = datetime.utcnow().isoformat()
+        collection = self.grpc_client.collections.get(self.collection_name)
+        
+        try:
+            with collection.batch.dynamic() as batch:
+                for chunk, embedding in pairs:
+                    if not embedding:
+                        errors.append(f"Failed to generate embedding for chunk {chunk.id}")
+                        failed_files.add(chunk.file_path)
+                        continue
+                    
+                    uuid = self._chunk_uuid(chunk)
+                    pending[uuid] = chunk
+                    batch.add_object(properties=self._chunk_properties(chunk, indexed_at), uuid=uuid, vector=embedding)
+        except Exception as e:
+            # We can't tell which batches made it, so count the whole lot as failed
+            errors.append(f"Batch import failed: {str(e)}")
+            failed_files.update(chunk.file_path for chunk in pending.values())
+            return 0, errors, failed_files
+        
+        failed = collection.batch.failed_objects
+        for failure in failed:
+            chunk = pending.get(str(failure.object_.uuid))
+            if chunk is not None:
+                errors.append(f"Failed to index chunk {chunk.id}: {failure.message}")
+                failed_files.add(chunk.file_path)
+            else:
+                errors.append(f"Failed to index object {failure.object_.uuid}: {failure.message}")
+        
+        return len(pending) - len(failed), errors, failed_files
+    
+    @staticmethod
+    def _chunk_properties(chunk: CodeChunk, indexed_at: str) -> Dict[str, Any]:
+        """Weaviate object properties for a chunk, stamped with the batch's ``indexed_at``."""
+        typed, extras = _split_metadata(chunk)
+        return {
+            **typed,
+            "content": chunk.content,
+            "content_preview": chunk.content_preview,
+            "chunk_type": chunk.chunk_type,
+            "file_path": chunk.file_path,
+            "language": chunk.language,
+            "start_line": chunk.start_line,
+            "end_line": chunk.end_line,
+            "parent_context": chunk.parent_context or "",
+            "metadata": dumps_metadata(extras),
+            "indexed_at": indexed_at
+        }
+    
+    @staticmethod
+    def _chunk_uuid(chunk: CodeChunk) -> str:
+        """
+        Deterministic Weaviate object UUID for a chunk.
+        
+        Derived from the chunk's location and a hash of its content, so an
+        unchanged chunk maps to the object already stored for it and an
+        edited one gets a new object.
+        """
+        content_hash = hashlib.blake2b(chunk.content.encode('utf-8'), digest_size=16).hexdigest()
+        return generate_uuid5(
+            f"{chunk.file_path}:{chunk.start_line}:{chunk.end_line}:{chunk.chunk_type}:{content_hash}"
+        )
+    
+    def _stored_uuids(self, file_path: str) -> set:
+        """Return the UUIDs of every object currently stored for a file."""
+        result = (
+            self.client.query
+            .get(self.collection_name, ["file_path"])
+            .with_additional(["id"])
+            .with_where({
+                "path": ["file_path"],
+                "operator": "Equal",
+                "valueString": file_path
+            })
+            .with_limit(10000)
+            .do()
+        )
+        objects = result.get("data", {}).get("Get", {}).get(self.collection_name) or []
+        return {obj["_additional"]["id"] for obj in objects}
+    
+    def delete_file_chunks(self, file_path: str) -> bool:
+        """
+        Delete every stored chunk of a file.
+        
+        Args:
+            file_path: Path of the file, as stored on its chunks
+            
+        Returns:
+            True if the delete request succeeded
+        """
+        try:
+            self.client.batch.delete_objects(
+                class_name=self.collection_name,
+                where={
+                    "path": ["file_path"],
+                    "operator": "Equal",
+                    "valueString": file_path
+                }
+            )
+            return True
+        except Exception as e:
+            logger.error(f"Failed to delete chunks for {file_path}: {e}")
+            return False
+    
+    @property
+    def manifest_path(self) -> Path:
+        """Location of the incremental-indexing manifest for this collection."""
+        return self.chunk_cache.db_path.parent / f"{self.collection_name}.manifest.json"
+    
+    def _load_manifest(self) -> Dict[str, Dict[str, Any]]:
+        """Load the manifest of indexed files, keyed by absolute path."""
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable manifest {self.manifest_path}: {e}")
+            return {}
+    
+    def _save_manifest(self, manifest: Dict[str, Dict[str, Any]]):
+        """Write the manifest atomically (temp file in the same directory, then rename)."""
+        manifest_path = self.manifest_path
+        manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=manifest_path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, indent=2)
+            os.replace(tmp_path, manifest_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    
+    def index_directory(self, directory_path: str, extensions: List[str] = None,
+                        workers: Optional[int] = None, full: bool = False) -> Dict[str, Any]:
         """
         Index all code files in a directory.
         
+        Indexing is incremental: a manifest of previously indexed files
+        (absolute path -> sha256, mtime, size) is kept next to the chunk cache,
+        and only new or modified files are chunked and embedded. Chunks of
+        modified and deleted files are removed from Weaviate first, as are
+        those of every indexed file when there is no manifest yet.
+        
+        Changed files are chunked in parallel worker processes (parsing is
+        CPU-bound and independent per file), then all chunks are embedded and
+        stored serially in full batches.
+        
         Args:
             directory_path: Path to directory
             extensions: List of file extensions to index (e.g., ['.py', '.js'])
+            workers: Number of chunking processes (defaults to the CPU count)
+            full: Re-index every file, ignoring the manifest
             
         Returns:
             Dictionary with indexing results
@@ -266,26 +915,161 @@ class VerbaCodeRAG:
             "files_processed": [],
             "total_files": 0,
             "total_chunks": 0,
+            "skipped_files": 0,
+            "deleted_files": [],
             "errors": []
         }
         
-        # Find all code files
+        # Diff against the manifest as files are discovered: unchanged files
+        # are skipped, modified ones have their old chunks deleted before
+        # being re-indexed
+        manifest = self._load_manifest()
+        # Without a manifest there is no record of what is stored; the
+        # collection may hold objects from before incremental indexing, under
+        # other UUIDs, so each file's old objects are deleted before writing
+        purge = not manifest
         code_files = []
-        for ext in extensions:
-            code_files.extend(directory.rglob(f"*{ext}"))
+        changed_files = []
+        entries = {}
+        for file_path in self._iter_code_files(directory_path, extensions):
+            code_files.append(file_path)
+            abs_path = os.path.abspath(file_path)
+            try:
+                stat = os.stat(file_path)
+                previous = manifest.get(abs_path)
+                if (not full and previous is not None
+                        and previous["mtime"] == stat.st_mtime and previous["size"] == stat.st_size):
+                    results["skipped_files"] += 1
+                    continue
+                sha = ChunkCache.file_sha(file_path)
+            except OSError as e:
+                results["errors"].append(f"{file_path}: {e}")
+                continue
+            
+            entries[file_path] = {"file_path": file_path, "sha256": sha,
+                                  "mtime": stat.st_mtime, "size": stat.st_size}
+            if not full and previous is not None and previous["sha256"] == sha:
+                # Touched but not edited
+                manifest[abs_path] = entries.pop(file_path)
+                results["skipped_files"] += 1
+                continue
+            
+            if previous is not None:
+                self.delete_file_chunks(previous["file_path"])
+            elif purge:
+                self.delete_file_chunks(file_path)
+            changed_files.append(file_path)
         
         results["total_files"] = len(code_files)
         
-        # Index each file
-        for file_path in code_files:
-            result = self.index_file(str(file_path))
-            results["files_processed"].append(result)
-            results["total_chunks"] += result["indexed_chunks"]
-            results["errors"].extend(result["errors"])
+        # Files under this directory that were indexed before but are now gone
+        present = {os.path.abspath(file_path) for file_path in code_files}
+        root = os.path.join(os.path.abspath(directory_path), '')
+        for abs_path in [path for path in manifest if path.startswith(root)]:
+            if abs_path not in present and abs_path.endswith(tuple(extensions)):
+                if self.delete_file_chunks(manifest[abs_path]["file_path"]):
+                    del manifest[abs_path]
+                    results["deleted_files"].append(abs_path)
+        
+        # Phase 1: chunk the changed files
+        all_chunks = []
+        chunk_failures = set()
+        shas = {file_path: entry["sha256"] for file_path, entry in entries.items()}
+        for file_path, chunks, error in self._chunk_files(changed_files, workers or os.cpu_count() or 1, shas):
+            if error is not None:
+                logger.error(f"Failed to chunk file {file_path}: {error}")
+                results["errors"].append(f"{file_path}: {error}")
+                chunk_failures.add(file_path)
+            results["files_processed"].append({
+                "file_path": file_path,
+                "total_chunks": len(chunks),
+                "success": error is None
+            })
+            all_chunks.extend(chunks)
+        
+        # Phase 2: embed and store all chunks together
+        indexed = self.index_chunks(all_chunks)
+        results["total_chunks"] = indexed["indexed_chunks"]
+        results["errors"].extend(indexed["errors"])
+        
+        # Only record files whose chunks all made it in, so failures are retried next run
+        failed = chunk_failures.union(indexed["failed_files"])
+        for file_path in changed_files:
+            if file_path in failed:
+                manifest.pop(os.path.abspath(file_path), None)
+            else:
+                manifest[os.path.abspath(file_path)] = entries[file_path]
+        self._save_manifest(manifest)
         
         return results
     
-    def search(self, query: str, limit: int = 10, chunk_types: List[str] = None) -> List[Dict[str, Any]]:
+    @staticmethod
+    def _iter_code_files(directory_path: str, extensions: List[str]) -> Iterator[str]:
+        """
+        Yield the paths of files under a directory that end in one of the extensions.
+        
+        The tree is walked once whatever the number of extensions, and paths
+        are yielded as they are found, in sorted order within each directory.
+        """
+        suffixes = tuple(extensions)
+        for root, dirs, files in os.walk(directory_path):
+            dirs.sort()
+            for name in sorted(files):
+                if name.endswith(suffixes):
+                    yield os.path.join(root, name)
+    
+    def _chunk_files(self, file_paths: List[str], workers: int,
+                     shas: Optional[Dict[str, str]] = None) -> List[Tuple[str, List[CodeChunk], Optional[str]]]:
+        """
+        Chunk files, serving unchanged ones from the chunk cache and parsing the rest in parallel.
+        
+        Args:
+            file_paths: Files to chunk
+            workers: Number of chunking processes
+            shas: Already-computed content hashes, by file path
+        
+        Returns:
+            List of (file_path, chunks, error message or None), in input order
+        """
+        results = {}
+        misses = []
+        
+        for file_path in file_paths:
+            try:
+                sha = shas[file_path] if shas and file_path in shas else ChunkCache.file_sha(file_path)
+            except OSError as e:
+                results[file_path] = ([], str(e))
+                continue
+            
+            cached = self.chunk_cache.get(file_path, sha)
+            if cached is not None:
+                results[file_path] = (cached, None)
+            else:
+                misses.append((file_path, sha))
+        
+        miss_paths = [file_path for file_path, _ in misses]
+        if workers > 1 and len(miss_paths) > 1:
+            workers = min(workers, len(miss_paths))
+            # Hand files out in shards of about a quarter of each worker's share:
+            # big enough to amortize the IPC round trips, small enough that one
+            # shard of large files doesn't leave the other workers idle
+            shard_size = max(1, len(miss_paths) // (workers * 4))
+            # Each worker builds its own chunker in the initializer rather than
+            # inheriting this process's clients across fork
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_chunk_worker) as executor:
+                chunked = list(executor.map(_chunk_file_in_worker, miss_paths, chunksize=shard_size))
+        else:
+            chunked = [_chunk_one(self.chunker, file_path) for file_path in miss_paths]
+        
+        for (file_path, sha), (chunks, error) in zip(misses, chunked):
+            if error is None:
+                self.chunk_cache.put(file_path, sha, chunks)
+            results[file_path] = (chunks, error)
+        
+        return [(file_path, *results[file_path]) for file_path in file_paths]
+    
+    def search(self, query: str, limit: int = 10, chunk_types: List[str] = None,
+               use_cache: bool = True, certainty: Optional[float] = None) -> List[Dict[str, Any]]:
         """
         Search for code chunks using semantic similarity.
         
@@ -293,29 +1077,78 @@ class VerbaCodeRAG:
             query: Search query
             limit: Maximum number of results
             chunk_types: Filter by chunk types (e.g., ['function', 'class'])
+            use_cache: Reuse the cached embedding of a previously seen query
+            certainty: Drop results below this similarity (0-1). Unset by
+                default: a plain top-``limit`` query lets HNSW stop as soon as
+                it has enough neighbours, while a threshold makes Weaviate
+                check every candidate against it and may return fewer results
             
         Returns:
             List of matching code chunks with metadata
         """
+        return list(self.search_iter(query, limit=limit, chunk_types=chunk_types,
+                                     use_cache=use_cache, certainty=certainty))
+    
+    def search_iter(self, query: str, limit: int = 10, chunk_types: List[str] = None,
+                    use_cache: bool = True, preview_only: bool = False,
+                    certainty: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Search for code chunks, yielding each result as soon as it is formatted.
+        
+        Lets callers start rendering the first hit while the rest are still
+        being processed. Takes the same arguments as ``search``, plus
+        ``preview_only``: fetch the stored ``content_preview`` (first 300
+        characters) in place of the full ``content``, so listings don't
+        transfer whole class bodies.
+        
+        Yields:
+            Matching code chunks with metadata, best match first
+        """
         # Generate embedding for query
-        query_embedding = self.generate_embedding(query)
+        query_embedding = self.embed_query(query, use_cache=use_cache)
         
         if not query_embedding:
             logger.error("Failed to generate query embedding")
-            return []
+            return
         
         # Build Weaviate query
-        near_vector = {
-            "vector": query_embedding,
-            "certainty": 0.7
-        }
+        content_field = "content_preview" if preview_only else "content"
+        properties = [
+            content_field, "chunk_type", "file_path", "language",
+            "start_line", "end_line", "parent_context", "metadata",
+            *METADATA_PROPERTIES
+        ]
+        
+        near_vector = self._near_vector_grpc if self.grpc_client is not None else self._near_vector
+        
+        # Execute search
+        try:
+            chunks = near_vector(query_embedding, properties, limit, chunk_types, certainty)
+            if preview_only and any(not chunk.get("content_preview") for chunk in chunks):
+                # Objects indexed before content_preview existed have none, so
+                # fall back to fetching the full content
+                content_field = "content"
+                properties[0] = content_field
+                chunks = near_vector(query_embedding, properties, limit, chunk_types, certainty)
+            
+            # Parse and format results
+            for chunk in chunks:
+                yield format_result(chunk, content_field)
+            
+        except Exception as e:
+            logger.error(f"Search failed: {e}")
+    
+    def _near_vector(self, vector: List[float], properties: List[str], limit: int,
+                     chunk_types: Optional[List[str]],
+                     certainty: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Run a nearVector query over REST and return the matching objects' properties."""
+        near_vector = {"vector": vector}
+        if certainty is not None:
+            near_vector["certainty"] = certainty
         
         query_builder = (
             self.client.query
-            .get(self.collection_name, [
-                "content", "chunk_type", "file_path", "language",
-                "start_line", "end_line", "parent_context", "metadata"
-            ])
+            .get(self.collection_name, properties)
             .with_near_vector(near_vector)
             .with_limit(limit)
         )
@@ -329,34 +1162,21 @@ class VerbaCodeRAG:
             }
             query_builder = query_builder.with_where(where_filter)
         
-        # Execute search
-        try:
-            results = query_builder.do()
-            
-            if self.collection_name in results.get("data", {}).get("Get", {}):
-                chunks = results["data"]["Get"][self.collection_name]
-                
-                # Parse and format results
-                formatted_results = []
-                for chunk in chunks:
-                    metadata = json.loads(chunk.get("metadata", "{}"))
-                    formatted_results.append({
-                        "content": chunk["content"],
-                        "chunk_type": chunk["chunk_type"],
-                        "file_path": chunk["file_path"],
-                        "language": chunk["language"],
-                        "location": f"{chunk['file_path']}:{chunk['start_line']}-{chunk['end_line']}",
-                        "parent_context": chunk.get("parent_context"),
-                        "metadata": metadata
-                    })
-                
-                return formatted_results
-            
-            return []
-            
-        except Exception as e:
-            logger.error(f"Search failed: {e}")
-            return []
+        results = query_builder.do()
+        return results.get("data", {}).get("Get", {}).get(self.collection_name) or []
+    
+    def _near_vector_grpc(self, vector: List[float], properties: List[str], limit: int,
+                          chunk_types: Optional[List[str]],
+                          certainty: Optional[float] = None) -> List[Dict[str, Any]]:
+        """``_near_vector`` over the v4 client's gRPC query API."""
+        response = self.grpc_client.collections.get(self.collection_name).query.near_vector(
+            near_vector=vector,
+            limit=limit,
+            certainty=certainty,
+            filters=Filter.by_property("chunk_type").contains_any(chunk_types) if chunk_types else None,
+            return_properties=properties
+        )
+        return [obj.properties for obj in response.objects]
     
     def generate_context(self, query: str, limit: int = 5) -> str:
         """
@@ -374,20 +1194,31 @@ class VerbaCodeRAG:
         if not results:
             return "No relevant code found."
         
-        context_parts = ["Here are the relevant code sections:\n"]
-        
-        for i, result in enumerate(results, 1):
-            context_parts.append(f"\n--- Code Chunk {i} ---")
-            context_parts.append(f"File: {result['file_path']}")
-            context_parts.append(f"Type: {result['chunk_type']}")
-            if result.get('parent_context'):
-                context_parts.append(f"Context: {result['parent_context']}")
-            context_parts.append(f"Location: Lines {result['location'].split(':')[1]}")
-            context_parts.append("\n```python")
-            context_parts.append(result['content'])
-            context_parts.append("```\n")
+        return "\n".join([_CONTEXT_HEADER] + [
+            _CONTEXT_CHUNK_TPL.format(
+                i=i,
+                file_path=result['file_path'],
+                chunk_type=result['chunk_type'],
+                context=f"Context: {result['parent_context']}\n" if result.get('parent_context') else "",
+                lines=result['location'].rsplit(':', 1)[1],
+                language=result.get('language') or "",
+                code=result['content']
+            )
+            for i, result in enumerate(results, 1)
+        ])
+    
+    def _build_prompt(self, question: str, context_limit: int) -> str:
+        """Build the RAG prompt for a question from the retrieved code context."""
+        # Retrieve relevant context
+        context = self.generate_context(question, limit=context_limit)
         
-        return "\n".join(context_parts)
+        return f"""You are a helpful code assistant. Use the provided code context to answer the question accurately.
+
+{context}
+
+Question: {question}
+
+Answer: """
     
     def answer_question(self, question: str, model: str = "llama3", context_limit: int = 5) -> str:
         """
@@ -401,17 +1232,7 @@ class VerbaCodeRAG:
         Returns:
             Generated answer
         """
-        # Retrieve relevant context
-        context = self.generate_context(question, limit=context_limit)
-        
-        # Create prompt
-        prompt = f"""You are a helpful code assistant. Use the provided code context to answer the question accurately.
-
-{context}
-
-Question: {question}
-
-Answer: """
+        prompt = self._build_prompt(question, context_limit)
         
         try:
             # Generate answer using Ollama
@@ -426,31 +1247,48 @@ Answer: """
             logger.error(f"Failed to generate answer: {e}")
             return f"Error generating answer: {str(e)}"
     
+    def answer_question_iter(self, question: str, model: str = "llama3",
+                             context_limit: int = 5) -> Iterator[str]:
+        """
+        Answer a question about code, yielding the answer as the model streams it.
+        
+        Takes the same arguments as ``answer_question``; uses Ollama's chat
+        endpoint with ``stream=True``.
+        
+        Yields:
+            Successive pieces of the generated answer
+        """
+        prompt = self._build_prompt(question, context_limit)
+        
+        try:
+            for part in self.ollama_client.chat(
+                model=model,
+                messages=[{"role": "user", "content": prompt}],
+                stream=True
+            ):
+                yield part['message']['content']
+        except Exception as e:
+            logger.error(f"Failed to generate answer: {e}")
+            yield f"Error generating answer: {str(e)}"
+    
     def get_stats(self) -> Dict[str, Any]:
         """Get statistics about indexed code chunks."""
         try:
-            # Query for all chunks to get counts
-            result = self.client.query.aggregate(self.collection_name).with_meta_count().do()
-            
-            total_chunks = result['data']['Aggregate'][self.collection_name][0]['meta']['count']
+            # One grouped aggregate returns the count of every chunk type;
+            # the total is their sum
+            result = (
+                self.client.query.aggregate(self.collection_name)
+                .with_group_by_filter(["chunk_type"])
+                .with_fields("groupedBy { value } meta { count }")
+                .do()
+            )
             
-            # Get chunk type distribution
             chunk_types = {}
-            for chunk_type in ['class', 'function', 'method', 'import', 'global', 'module_docstring']:
-                where_filter = {
-                    "path": ["chunk_type"],
-                    "operator": "Equal",
-                    "valueString": chunk_type
-                }
-                type_result = (
-                    self.client.query.aggregate(self.collection_name)
-                    .with_meta_count()
-                    .with_where(where_filter)
-                    .do()
-                )
-                count = type_result['data']['Aggregate'][self.collection_name][0]['meta']['count']
+            for group in result['data']['Aggregate'][self.collection_name]:
+                count = group['meta']['count']
                 if count > 0:
-                    chunk_types[chunk_type] = count
+                    chunk_types[group['groupedBy']['value']] = count
+            total_chunks = sum(chunk_types.values())
             
             return {
                 "total_chunks": total_chunks,
@@ -463,6 +1301,7 @@ Answer: """
             return {
                 "total_chunks": 0,
                 "chunk_types": {},
+                "collection": self.collection_name,
                 "error": str(e)
             }
 